@@ -22,7 +22,7 @@ import threading
 import uuid  # UUID 추가
 from .message import MessageManager, Message, MessageType
 from typing import Optional, Any, Dict, List
-from .settings_manager import settings_manager
+from .settings_manager import get_settings_manager
 from .auto_difficulty import extract_difficulty
 from anki.cards import Card
 from aqt.reviewer import Reviewer
@@ -856,7 +856,7 @@ Time: {datetime.now().strftime('%H:%M:%S.%f')}
 
             self.last_response = response_json
 
-            settings = settings_manager.load_settings()
+            settings = get_settings_manager().load_settings()
             provider_type = settings.get("providerType", "openai").lower()
             if provider_type == "openai":
                 model_name = settings.get("modelName", "Unknown Model")
@@ -887,7 +887,7 @@ Time: {datetime.now().strftime('%H:%M:%S.%f')}
             processed_content = self.markdown_to_html(response_text)
             self.last_response = response_text
 
-            settings = settings_manager.load_settings()
+            settings = get_settings_manager().load_settings()
             provider_type = settings.get("providerType", "openai").lower()
             if provider_type == "openai":
                 model_name = settings.get("modelName", "Unknown Model")
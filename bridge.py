@@ -46,9 +46,9 @@ from aqt.gui_hooks import (
     reviewer_will_show_context_menu,
 )
 from .providers import LLMProvider, OpenAIProvider, GeminiProvider
-import traceback
+from .providers.base import CachedTimeFormatter, set_debug_logging as set_provider_debug_logging
 from .message import MessageType, Message
-from .settings_manager import settings_manager
+from .settings_manager import get_settings_manager
 from .providers.provider_factory import get_provider
 from aqt.qt import QSettings
 from .auto_difficulty import extract_difficulty  # 재정의
@@ -82,57 +82,35 @@ if _debug_flag:
     file_handler.setLevel(logging.DEBUG)
 
 # Create formatters
-debug_formatter = logging.Formatter(
+debug_formatter = CachedTimeFormatter(
     '%(asctime)s - %(name)s - %(levelname)s\n'
     'File: %(filename)s:%(lineno)d\n'
     'Function: %(funcName)s\n'
     'Message: %(message)s\n'
 )
 
-error_formatter = logging.Formatter(
+error_formatter = CachedTimeFormatter(
     '\n=== Error Log ===\n'
     '%(asctime)s - %(name)s - %(levelname)s\n'
     'File: %(filename)s:%(lineno)d\n'
     'Function: %(funcName)s\n'
     'Message: %(message)s\n'
-    'Stack Trace:\n%(stack_trace)s\n'
     '================\n'
 )
 
-class ErrorLogFilter(logging.Filter):
-    """에러 로그에 스택 트레이스를 추가하는 필터"""
-    def filter(self, record):
-        if record.levelno >= logging.ERROR:
-            record.stack_trace = traceback.format_stack()
-        return True
-
 if file_handler:
-    # Add formatter and filter to handler
+    # Add formatter to handler
     file_handler.setFormatter(debug_formatter)
-    file_handler.addFilter(ErrorLogFilter())
     # Add the handler to the logger
     logger.addHandler(file_handler)
 
 def log_error(e, context=None):
-    """상세한 에러 로깅을 위한 유틸리티 함수"""
-    error_info = {
-        'timestamp': datetime.now().isoformat(),
-        'error_type': type(e).__name__,
-        'error_message': str(e),
-        'stack_trace': traceback.format_exc(),
-        'context': context or {}
-    }
-    
+    """상세한 에러 로깅을 위한 유틸리티 함수 (포매팅과 트레이스백 생성은 핸들러가 출력할 때 수행)"""
     logger.error(
-        "\n=== Error Details ===\n"
-        f"Time: {error_info['timestamp']}\n"
-        f"Type: {error_info['error_type']}\n"
-        f"Message: {error_info['error_message']}\n"
-        f"Context: {error_info['context']}\n"
-        f"Stack Trace:\n{error_info['stack_trace']}\n"
-        "===================="
+        "\n=== Error Details ===\nType: %s\nMessage: %s\nContext: %s\n====================",
+        type(e).__name__, e, context or {},
+        exc_info=e
     )
-    return error_info
 
 logger.info("Addon load start")
 
@@ -226,10 +204,10 @@ class Bridge(QObject):
         self.thread_pool = ThreadPoolExecutor(max_workers=3)
         
         # 설정 매니저에 옵저버로 등록
-        settings_manager.add_observer(self)
+        get_settings_manager().add_observer(self)
         
         # 초기 설정 로드
-        settings = settings_manager.load_settings()
+        settings = get_settings_manager().load_settings()
         self.update_config(settings)
         
         self.partial_response = ""
@@ -358,7 +336,7 @@ class Bridge(QObject):
     def update_llm_provider(self, settings=None):
         """Update LLM provider with the given or current settings"""
         if settings is None:
-            settings = settings_manager.load_settings()
+            settings = get_settings_manager().load_settings()
         provider_type = settings.get("providerType", "openai").lower()
 
         self.system_prompt = settings.get("systemPrompt", "You are a helpful assistant.")
@@ -471,7 +449,7 @@ class Bridge(QObject):
             logger.debug("Received answer from JS: %s", user_answer)
             try:
                 # 설정값 로깅 추가
-                settings = settings_manager.load_settings()
+                settings = get_settings_manager().load_settings()
                 easy_threshold = int(settings.get("easyThreshold", "5"))
                 good_threshold = int(settings.get("goodThreshold", "15"))
                 hard_threshold = int(settings.get("hardThreshold", "50"))
@@ -525,7 +503,7 @@ class Bridge(QObject):
             model = note.model()
             model_type = model.get('type')
             
-            settings = settings_manager.load_settings()
+            settings = get_settings_manager().load_settings()
             easy_threshold = int(settings.get("easyThreshold", 5))
             good_threshold = int(settings.get("goodThreshold", 15))
             hard_threshold = int(settings.get("hardThreshold", 50))
@@ -1243,6 +1221,7 @@ class Bridge(QObject):
             desired_level = logging.DEBUG if debug_logging else logging.INFO
             try:
                 logger.setLevel(desired_level)
+                set_provider_debug_logging(debug_logging)
                 for h in logger.handlers:
                     try:
                         h.setLevel(desired_level)
@@ -1265,7 +1244,6 @@ class Bridge(QObject):
                         fh.setLevel(logging.DEBUG)
                         try:
                             fh.setFormatter(debug_formatter)
-                            fh.addFilter(ErrorLogFilter())
                         except Exception:
                             pass
                         logger.addHandler(fh)
@@ -42,7 +42,7 @@ from aqt.qt import (
 
 from .message import MessageManager, show_info
 from .providers import OpenAIProvider, GeminiProvider, provider_factory
-from .settings_manager import settings_manager
+from .settings_manager import get_settings_manager
 from .bridge import Bridge
 from .answer_checker_window import AnswerCheckerWindow
 
@@ -142,7 +142,7 @@ def initialize_addon() -> None:
     global bridge, chat_service, answer_checker_window
     try:
         # 설정 로드
-        settings: Dict[str, Any] = settings_manager.load_settings()
+        settings: Dict[str, Any] = get_settings_manager().load_settings()
         mw.llm_addon_settings = settings
         
         # Instantiate chat_service using provider factory
@@ -154,7 +154,7 @@ def initialize_addon() -> None:
             bridge = Bridge()
             # Register Bridge as observer of settings changes
             try:
-                settings_manager.add_observer(bridge)
+                get_settings_manager().add_observer(bridge)
             except Exception:
                 pass
             
@@ -169,7 +169,7 @@ def initialize_addon() -> None:
             
         # Ensure main logger reacts to settings changes
         try:
-            settings_manager.add_observer(_MainLogObserver())
+            get_settings_manager().add_observer(_MainLogObserver())
         except Exception:
             pass
 
@@ -392,7 +392,7 @@ def load_settings():
 
 def load_global_settings():
     """Loads global settings and synchronize logging according to settings_manager"""
-    settings = settings_manager.load_settings()
+    settings = get_settings_manager().load_settings()
     mw.llm_addon_settings = settings
 
     debug_logging = bool(settings.get("debug_logging", False))
@@ -568,7 +568,7 @@ class SettingsDialog(QDialog):
 
     def loadSettings(self):
         """Loads settings into UI"""
-        settings = settings_manager.load_settings()
+        settings = get_settings_manager().load_settings()
         
         # API provider settings
         provider = settings.get("providerType", "openai")
@@ -612,7 +612,7 @@ class SettingsDialog(QDialog):
             "debug_logging": self.debugLoggingCheckbox.isChecked()
         }
         
-        if settings_manager.save_settings(settings):
+        if get_settings_manager().save_settings(settings):
             showInfo("Settings saved successfully.")
             self.accept()
         else:
@@ -712,7 +712,7 @@ class MainController:
     
     def initialize_provider(self) -> None:
         try:
-            provider_name = settings_manager.get("provider", "openai")
+            provider_name = get_settings_manager().get("provider", "openai")
             self.current_provider = provider_factory.create_provider(provider_name)
         except Exception as e:
             logger.error(f"프로바이더 초기화 실패: {str(e)}")
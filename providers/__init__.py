@@ -18,19 +18,25 @@ from .base import (
     APIConnectionError,
     APIResponseError,
     InvalidAPIKeyError,
+    RateLimitError,
     LLMProviderError
 )
 
+from .aio import AsyncOpenAIProvider, AsyncGeminiProvider
+
 from .provider_factory import get_provider, ProviderFactoryError
 
 __all__: List[str] = [
     'LLMProvider',
     'OpenAIProvider',
     'GeminiProvider',
+    'AsyncOpenAIProvider',
+    'AsyncGeminiProvider',
     'get_provider',
     'APIConnectionError',
     'APIResponseError',
     'InvalidAPIKeyError',
+    'RateLimitError',
     'LLMProviderError',
     'ProviderFactoryError'
 ]
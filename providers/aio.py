@@ -0,0 +1,205 @@
+"""
+비동기(aiohttp) LLM 프로바이더
+
+여러 카드를 한꺼번에 채점할 때 스레드 풀 대신 하나의 이벤트 루프에서
+많은 요청을 동시에 보내기 위한 프로바이더입니다. aiohttp가 설치된 경우에만 사용할 수 있습니다.
+"""
+
+import asyncio
+import random
+from abc import ABC, abstractmethod
+from typing import Any, Dict, List, Optional, Tuple
+
+from .base import (
+    OpenAIProvider,
+    GeminiProvider,
+    APIConnectionError,
+    APIResponseError,
+    LLMProviderError,
+    RateLimitError,
+    _HTTP_STATUS_ERRORS,
+    _json_dumps,
+    _json_loads,
+    log_error,
+    logger,
+)
+from .cache import response_cache
+
+try:
+    import aiohttp
+    AIOHTTP_AVAILABLE = True
+except ImportError:
+    AIOHTTP_AVAILABLE = False
+
+
+class _AsyncProviderMixin(ABC):
+    """aiohttp 세션, 비동기 재시도, 동시 호출 제한을 제공하는 믹스인"""
+    # call_api_many에서 동시에 진행할 최대 요청 수
+    MAX_CONCURRENCY: int = 32
+
+    def _init_async(self) -> None:
+        if not AIOHTTP_AVAILABLE:
+            raise LLMProviderError(
+                "Async providers require the aiohttp package.",
+                "Install aiohttp or use the synchronous provider."
+            )
+        self._async_session: Optional["aiohttp.ClientSession"] = None
+        # 세션은 생성한 이벤트 루프에 묶이므로 함께 기억 (asyncio.run을 배치마다 호출하면 루프가 바뀜)
+        self._async_session_loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def _get_async_session(self) -> "aiohttp.ClientSession":
+        """실행 중인 이벤트 루프에서 사용할 세션을 반환합니다. 루프가 바뀌었으면 새로 생성합니다."""
+        loop = asyncio.get_running_loop()
+        if self._async_session is None or self._async_session.closed or self._async_session_loop is not loop:
+            # 이전 루프의 세션은 그 루프가 이미 닫혀 정리할 수 없으므로 버림
+            connector = aiohttp.TCPConnector(limit=64, limit_per_host=32, ttl_dns_cache=300)
+            connect_timeout, read_timeout = self.REQUEST_TIMEOUT
+            timeout = aiohttp.ClientTimeout(sock_connect=connect_timeout, sock_read=read_timeout)
+            self._async_session = aiohttp.ClientSession(connector=connector, timeout=timeout)
+            self._async_session_loop = loop
+        return self._async_session
+
+    async def _post_json(self, url: str, headers: Dict[str, str], data: Dict[str, Any]) -> Dict[str, Any]:
+        """요청을 보내고 JSON 응답을 반환합니다. 오류는 동기 경로와 같은 예외로 변환합니다."""
+        session = self._get_async_session()
+        try:
+            async with session.post(url, headers=headers, data=_json_dumps(data)) as response:
+                body = await response.read()
+                if response.status >= 400:
+                    body_snippet = body[:500].decode('utf-8', 'replace') + ('...' if len(body) > 500 else '')
+                    logger.error("HTTPError from API (status=%s) body=%s", response.status, body_snippet)
+                    error_factory = _HTTP_STATUS_ERRORS.get(response.status)
+                    if error_factory is not None:
+                        raise error_factory(response.headers)
+                    raise APIConnectionError(f"HTTP error occurred: {response.status} | Response body: {body_snippet}")
+                try:
+                    return _json_loads(body)
+                except ValueError as e:
+                    logger.error("Invalid JSON in API response: %s", e)
+                    raise APIResponseError("Invalid API response format.")
+        except asyncio.TimeoutError as e:
+            raise APIConnectionError(f"Request timed out: {str(e)}")
+        except aiohttp.ClientError as e:
+            raise APIConnectionError(f"Failed to connect to server: {str(e)}")
+
+    async def _retry_with_exponential_backoff_async(self, func, *args: Any) -> Any:
+        """지수 백오프 비동기 재시도 (aiohttp 세션에는 동기 세션의 urllib3 Retry가 없으므로 직접 재시도)"""
+        max_retries = self.retry_config.max_retries
+        for retry_count in range(1, max_retries + 1):
+            try:
+                return await func(*args)
+            except APIConnectionError as e:
+                if retry_count == max_retries:
+                    raise
+                delay = min(self.retry_config.base_delay * (1 << (retry_count - 1)), self.retry_config.max_delay)
+                delay = random.uniform(delay / 2, delay)
+                logger.warning(
+                    "API 호출 실패 (시도 %d/%d)\nError: %s\nDelay: retrying in %.2f seconds",
+                    retry_count, max_retries, e, delay
+                )
+                await asyncio.sleep(delay)
+
+    @abstractmethod
+    async def _generate_response_async(self, messages: List[Dict[str, Any]], temperature: float) -> str:
+        """메시지 목록을 API로 비동기 전송하고 응답 텍스트를 반환합니다. (call_api에서 재시도와 함께 사용)"""
+        pass
+
+    async def call_api(self, system_message: str, user_message: str, temperature: Optional[float] = None) -> str:
+        """LLM API를 비동기로 호출하여 응답을 받아옵니다."""
+        if temperature is None:
+            temperature = self.temperature
+        messages = [{"role": "user", "content": user_message}]
+        return await self._retry_with_exponential_backoff_async(
+            self._generate_response_async, messages, temperature
+        )
+
+    async def call_api_batch(
+        self,
+        items: List[Tuple[str, str]],
+        temperature: Optional[float] = None
+    ) -> List[str]:
+        """call_api_batch의 비동기 버전
+
+        동기 프로바이더의 묶음 요청 대신 (system_message, user_message) 항목을
+        최대 MAX_CONCURRENCY개씩 동시에 호출하고 입력 순서대로 응답을 반환합니다.
+        """
+        semaphore = asyncio.Semaphore(self.MAX_CONCURRENCY)
+
+        async def _call(system_message: str, user_message: str) -> str:
+            async with semaphore:
+                return await self.call_api(system_message, user_message, temperature)
+
+        return list(await asyncio.gather(*(_call(system, user) for system, user in items)))
+
+    async def call_api_many(
+        self,
+        user_messages: List[str],
+        system_message: str = "",
+        temperature: Optional[float] = None
+    ) -> List[str]:
+        """여러 프롬프트를 최대 MAX_CONCURRENCY개씩 동시에 호출하고 입력 순서대로 응답을 반환합니다."""
+        return await self.call_api_batch([(system_message, message) for message in user_messages], temperature)
+
+    async def aclose(self) -> None:
+        """aiohttp 세션을 닫습니다."""
+        if self._async_session is not None and not self._async_session.closed:
+            await self._async_session.close()
+        self._async_session = None
+        self._async_session_loop = None
+
+
+class AsyncOpenAIProvider(_AsyncProviderMixin, OpenAIProvider):
+    """aiohttp로 OpenAI API를 호출하는 비동기 프로바이더"""
+    def __init__(self, api_key, base_url, model, temperature=0.7):
+        super().__init__(api_key, base_url, model, temperature)
+        self._init_async()
+
+    async def _generate_response_async(self, messages, temperature):
+        payload = self._build_payload(messages, temperature)
+        cache_key = self._response_cache_key(messages, payload["temperature"])
+        if cache_key is not None:
+            cached = response_cache.get(cache_key)
+            if cached is not None:
+                return cached
+
+        result = await self._post_json(self._url, self._headers, payload)
+        try:
+            content = self._extract_content(result)
+        except (ValueError, KeyError, AttributeError) as e:
+            log_error(e, {'result': result, 'model': self.model_name, 'temperature': temperature})
+            raise APIResponseError("Invalid AI response format.")
+        if cache_key is not None:
+            response_cache.set(cache_key, content, self.model_name)
+        return content
+
+
+class AsyncGeminiProvider(_AsyncProviderMixin, GeminiProvider):
+    """aiohttp로 Gemini API를 호출하는 비동기 프로바이더"""
+    def __init__(self, api_key, model_name="gemini-2.0-flash-exp", temperature=0.7):
+        super().__init__(api_key, model_name, temperature)
+        self._init_async()
+
+    async def _generate_response_async(self, messages, temperature):
+        cache_key = self._response_cache_key(messages, temperature)
+        if cache_key is not None:
+            cached = response_cache.get(cache_key)
+            if cached is not None:
+                return cached
+
+        api_key = self._get_next_api_key()
+        try:
+            result = await self._post_json(
+                self._generate_url + api_key, self._headers, self._build_request_data(messages, temperature)
+            )
+        except RateLimitError as e:
+            # 재시도 시에는 대기 중인 이 키를 건너뜀
+            self._cool_down_key(api_key, e.retry_after)
+            raise
+        try:
+            text = self._extract_text(result)
+        except (KeyError, IndexError) as e:
+            log_error(e, {'result': result, 'temperature': temperature})
+            raise APIResponseError("Invalid API response format.")
+        if cache_key is not None:
+            response_cache.set(cache_key, text, self.model_name)
+        return text
@@ -1,17 +1,31 @@
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util import Retry
+import hashlib
+import json
 import logging
 import os
 import time
-import traceback
 from abc import ABC, abstractmethod
-from datetime import datetime
-import random
 import re
-from typing import Optional, Any, Dict, List, Generator, Callable, TypeVar, Union, cast, Protocol
+import threading
+from typing import Optional, Any, Dict, List, Generator, Callable, Tuple, Type, TypeVar, Union, Protocol
 import concurrent.futures
 from concurrent.futures import Future, ThreadPoolExecutor
 from dataclasses import dataclass
 
+from .cache import get_semantic_cache, response_cache
+
+# orjson이 있으면 요청/응답 JSON 처리에 사용 (없으면 표준 json으로 대체)
+try:
+    import orjson
+    _json_dumps = orjson.dumps
+    _json_loads = orjson.loads
+except ImportError:
+    def _json_dumps(obj: Any) -> bytes:
+        return json.dumps(obj).encode('utf-8')
+    _json_loads = json.loads
+
 # Logging setup
 addon_dir = os.path.dirname(os.path.abspath(__file__))
 log_file_path = os.path.join(addon_dir, 'MyAnswerChecker_debug.log')
@@ -19,64 +33,68 @@ os.makedirs(addon_dir, exist_ok=True)
 
 # Create a logger
 logger = logging.getLogger(__name__)
-logger.setLevel(logging.DEBUG)
+# 기본은 INFO (디버그 로그는 debug_logging 설정이 켜졌을 때만 set_debug_logging으로 활성화)
+logger.setLevel(logging.INFO)
 
-# Create a file handler
-file_handler = logging.FileHandler(log_file_path, encoding='utf-8')
+# Create a file handler (실제 기록이 있을 때 파일을 엶)
+file_handler = logging.FileHandler(log_file_path, encoding='utf-8', delay=True)
 file_handler.setLevel(logging.DEBUG)
 
+class CachedTimeFormatter(logging.Formatter):
+    """같은 초에 기록된 로그끼리 asctime 문자열을 재사용하는 포매터"""
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._cached_time = (None, "")
+
+    def formatTime(self, record, datefmt=None):
+        if datefmt:
+            return super().formatTime(record, datefmt)
+        second = int(record.created)
+        cached_second, cached_str = self._cached_time
+        if second != cached_second:
+            cached_str = time.strftime('%Y-%m-%d %H:%M:%S', self.converter(record.created))
+            self._cached_time = (second, cached_str)
+        return self.default_msec_format % (cached_str, record.msecs)
+
 # Create formatters
-debug_formatter = logging.Formatter(
+debug_formatter = CachedTimeFormatter(
     '%(asctime)s - %(name)s - %(levelname)s\n'
     'File: %(filename)s:%(lineno)d\n'
     'Function: %(funcName)s\n'
     'Message: %(message)s\n'
 )
 
-error_formatter = logging.Formatter(
+error_formatter = CachedTimeFormatter(
     '\n=== Error Log ===\n'
     '%(asctime)s - %(name)s - %(levelname)s\n'
     'File: %(filename)s:%(lineno)d\n'
     'Function: %(funcName)s\n'
     'Message: %(message)s\n'
-    'Stack Trace:\n%(stack_trace)s\n'
     '================\n'
 )
 
-class ErrorLogFilter(logging.Filter):
-    """에러 로그에 스택 트레이스를 추가하는 필터"""
-    def filter(self, record):
-        if record.levelno >= logging.ERROR:
-            record.stack_trace = traceback.format_stack()
-        return True
-
-# Add formatter and filter to handler
+# Add formatter to handler
 file_handler.setFormatter(debug_formatter)
-file_handler.addFilter(ErrorLogFilter())
 
-# Add the handler to the logger
-logger.addHandler(file_handler)
+# Add the handler to the logger (모듈이 다시 로드되어도 같은 파일 핸들러를 중복 추가하지 않음)
+if not any(
+    isinstance(h, logging.FileHandler) and h.baseFilename == log_file_path
+    for h in logger.handlers
+):
+    logger.addHandler(file_handler)
+
+def set_debug_logging(enabled: bool) -> None:
+    """debug_logging 설정에 따라 프로바이더 로거의 레벨을 DEBUG/INFO로 전환합니다."""
+    logger.setLevel(logging.DEBUG if enabled else logging.INFO)
 
 def log_error(e, context=None):
-    """상세한 에러 로깅을 위한 유틸리티 함수"""
-    error_info = {
-        'timestamp': datetime.now().isoformat(),
-        'error_type': type(e).__name__,
-        'error_message': str(e),
-        'stack_trace': traceback.format_exc(),
-        'context': context or {}
-    }
-    
+    """상세한 에러 로깅을 위한 유틸리티 함수 (포매팅과 트레이스백 생성은 핸들러가 출력할 때 수행)"""
     logger.error(
-        "\n=== Error Details ===\n"
-        f"Time: {error_info['timestamp']}\n"
-        f"Type: {error_info['error_type']}\n"
-        f"Message: {error_info['error_message']}\n"
-        f"Context: {error_info['context']}\n"
-        f"Stack Trace:\n{error_info['stack_trace']}\n"
-        "===================="
+        "\n=== Error Details ===\nType: %s\nMessage: %s\nContext: %s\n====================",
+        type(e).__name__, e, context or {},
+        exc_info=e,
+        extra={'error_type': type(e).__name__, 'error_context': context or {}}
     )
-    return error_info
 
 class LLMProviderError(Exception):
     """LLM 프로바이더 관련 기본 예외 클래스"""
@@ -102,6 +120,13 @@ class APIConnectionError(LLMProviderError):
             
         super().__init__(f"Failed to connect to the AI server: {message}", help_text)
 
+class RateLimitError(APIConnectionError):
+    """요청 한도 초과(HTTP 429) 예외. 서버가 알려준 재시도 대기 시간(초)을 함께 전달합니다."""
+    def __init__(self, message, retry_after=None):
+        super().__init__(message)
+        self.retry_after = retry_after
+        self.help_text = "You're being rate-limited. Please try again later."
+
 class APIResponseError(LLMProviderError):
     """API 응답 처리 관련 예외"""
     def __init__(self, message):
@@ -123,54 +148,25 @@ class InvalidAPIKeyError(LLMProviderError):
         help_text = "Please check your API key in Settings and ensure it is entered correctly."
         super().__init__("Invalid API key", help_text)
 
-class RetryWithExponentialBackoff:
-    """지수 백오프를 사용한 재시도 데코레이터"""
-    def __init__(self, max_retries=3, base_delay=1, max_delay=8):
-        self.max_retries = max_retries
-        self.base_delay = base_delay
-        self.max_delay = max_delay
-
-    def __call__(self, func):
-        def wrapper(*args, **kwargs):
-            retry_count = 0
-            last_error = None
-            
-            while retry_count < self.max_retries:
-                try:
-                    logger.debug(
-                        f"API 요청 시도 {retry_count + 1}/{self.max_retries}\n"
-                        f"Function: {func.__name__}\n"
-                        f"Args: {args}\n"
-                        f"Kwargs: {kwargs}"
-                    )
-                    return func(*args, **kwargs)
-                    
-                except requests.exceptions.RequestException as e:
-                    retry_count += 1
-                    last_error = e
-                    
-                    error_context = {
-                        'attempt': retry_count,
-                        'max_retries': self.max_retries,
-                        'function': func.__name__,
-                        'args': args,
-                        'kwargs': kwargs
-                    }
-                    
-                    if retry_count == self.max_retries:
-                        log_error(e, error_context)
-                        raise APIConnectionError(f"API connection failed: {str(e)}")
-                    
-                    delay = min(self.base_delay * (2 ** (retry_count - 1)), self.max_delay)
-                    logger.warning(
-                        f"API 호출 실패 (시도 {retry_count}/{self.max_retries})\n"
-                        f"Error: {str(e)}\n"
-                        f"Delay: retrying in {delay} seconds"
-                    )
-                    time.sleep(delay)
-                    
-            return None
-        return wrapper
+# 로그에 남기는 URL에서 API 키를 가리기 위한 패턴
+_KEY_RE = re.compile(r'(key=)([^&]+)')
+
+def _retry_after_seconds(headers) -> Optional[float]:
+    """Retry-After 헤더(초 단위)를 읽습니다. 없거나 날짜 형식이면 None."""
+    try:
+        return float(headers.get("Retry-After"))
+    except (TypeError, ValueError):
+        return None
+
+# HTTP 상태 코드별 예외 매핑 (_make_api_request에서 사용, 응답 헤더를 받아 예외 생성)
+_HTTP_STATUS_ERRORS: Dict[int, Callable[[Any], LLMProviderError]] = {
+    401: lambda headers: InvalidAPIKeyError("Invalid API key"),
+    429: lambda headers: RateLimitError("API rate limit exceeded", _retry_after_seconds(headers)),
+}
+
+class _NoRateLimitRetry(Retry):
+    """429는 Retry-After 헤더가 있어도 재시도하지 않는 Retry (다른 API 키로 넘기는 프로바이더용)"""
+    RETRY_AFTER_STATUS_CODES = Retry.RETRY_AFTER_STATUS_CODES - {429}
 
 @dataclass
 class RetryConfig:
@@ -184,109 +180,209 @@ class APIResponse(Protocol):
     text: str
     json: Callable[[], Dict[str, Any]]
 
+# 여러 요청을 한 번에 보낼 때 앞에 붙이는 지시문 (call_api_batch)
+BATCH_INSTRUCTION = (
+    "Answer each of the following {count} requests independently, as if each were sent on its own. "
+    "Reply only with a JSON object of the form "
+    '{{"results": [{{"id": <request id>, "response": "<your full reply>"}}]}} '
+    "containing exactly one entry per request id.\n\n"
+)
+
 # Define TypeVar for generic type
 T = TypeVar('T')
 
+# 모든 프로바이더가 공유하는 작업 스레드 풀 (MYAC_POOL 환경 변수로 크기 조정)
+_POOL_MAX_WORKERS = int(os.getenv("MYAC_POOL", "16"))
+_GLOBAL_POOL: Optional[ThreadPoolExecutor] = None
+_GLOBAL_POOL_LOCK = threading.Lock()
+# 실행 중 + 대기 중 작업 수 상한. 넘으면 무한정 쌓지 않고 즉시 거절
+_POOL_SLOTS = threading.BoundedSemaphore(_POOL_MAX_WORKERS * 2)
+
+def _get_pool() -> ThreadPoolExecutor:
+    """공유 스레드 풀을 처음 _execute_async가 호출될 때 생성합니다 (동기 호출만 쓰면 만들지 않음)."""
+    global _GLOBAL_POOL
+    if _GLOBAL_POOL is None:
+        with _GLOBAL_POOL_LOCK:
+            if _GLOBAL_POOL is None:
+                _GLOBAL_POOL = ThreadPoolExecutor(max_workers=_POOL_MAX_WORKERS, thread_name_prefix="llm")
+    return _GLOBAL_POOL
+
 class LLMProvider(ABC):
     """LLM 서비스 호출을 위한 추상 기본 클래스"""
+    # (연결, 읽기) 타임아웃 - 응답 없는 소켓이 스레드를 무한정 붙잡지 않도록
+    REQUEST_TIMEOUT: Tuple[float, float] = (5, 120)
+    # 전송 계층(urllib3)에서 재시도할 HTTP 상태 코드
+    RETRY_STATUS_CODES: Tuple[int, ...] = (429, 500, 502, 503, 504)
+    # 전송 계층 재시도에 사용할 urllib3 Retry 클래스
+    TRANSPORT_RETRY_CLASS: Type[Retry] = Retry
+
     def __init__(self) -> None:
         self.retry_config: RetryConfig = RetryConfig()
-        self.thread_pool: ThreadPoolExecutor = ThreadPoolExecutor(max_workers=3)
-        self._setup_logging()
-
-    def _setup_logging(self) -> None:
-        """로깅 설정"""
-        logger.setLevel(logging.DEBUG)
-        file_handler = logging.FileHandler(log_file_path, encoding='utf-8')
-        file_handler.setLevel(logging.DEBUG)
-        formatter = logging.Formatter(
-            '%(asctime)s - %(name)s - %(levelname)s\n'
-            'File: %(filename)s:%(lineno)d\n'
-            'Function: %(funcName)s\n'
-            'Message: %(message)s\n'
+        # keep-alive 연결을 재사용하여 매 요청마다 TCP/TLS 핸드셰이크를 반복하지 않음
+        self.session: requests.Session = requests.Session()
+        self.session.mount("https://", HTTPAdapter(pool_connections=8, pool_maxsize=32, max_retries=self._build_transport_retry()))
+        # temperature가 0이 아니어도 응답을 캐시할지 여부 (get_provider에서 설정)
+        self.cache_all_responses: bool = False
+        self.semantic_cache_enabled: bool = False
+        # 진행 중인 동일 요청 병합용 (요청 키 -> Future)
+        self._inflight: Dict[str, Future] = {}
+        self._inflight_lock = threading.Lock()
+
+    def _build_transport_retry(self) -> Retry:
+        """연결 오류와 429/5xx 응답을 전송 계층에서 재시도하는 urllib3 Retry 설정 (읽기 타임아웃은 제외)
+
+        429 응답의 Retry-After 헤더를 따르며, 최종 실패 응답은 그대로 반환되어
+        _make_api_request의 상태 코드 매핑으로 처리됩니다.
+        """
+        retry_kwargs = dict(
+            total=self.retry_config.max_retries,
+            # 읽기 타임아웃은 재시도하지 않음 (서버가 이미 처리 중인 요청을 다시 보내 과금/대기가 늘어남)
+            read=False,
+            backoff_factor=self.retry_config.base_delay,
+            status_forcelist=self.RETRY_STATUS_CODES,
+            allowed_methods=frozenset({"POST"}),
+            respect_retry_after_header=True,
+            raise_on_status=False
         )
-        file_handler.setFormatter(formatter)
-        logger.addHandler(file_handler)
+        try:
+            # urllib3 2.x: 동시에 실패한 요청들이 같은 시각에 재시도하지 않도록 지터 추가
+            return self.TRANSPORT_RETRY_CLASS(
+                backoff_jitter=self.retry_config.base_delay / 2,
+                backoff_max=self.retry_config.max_delay,
+                **retry_kwargs
+            )
+        except TypeError:
+            # Anki에 번들된 urllib3 1.x에는 backoff_jitter/backoff_max 인자가 없음
+            return self.TRANSPORT_RETRY_CLASS(**retry_kwargs)
 
     @abstractmethod
     def call_api(self, system_message: str, user_message: str, temperature: float = 0.2) -> str:
         """LLM API를 호출하여 응답을 받아옵니다."""
         pass
 
-    def _retry_with_exponential_backoff(self, func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
-        """지수 백오프를 사용한 재시도 로직"""
-        retry_count = 0
-        last_error: Optional[Exception] = None
-        
-        while retry_count < self.retry_config.max_retries:
-            try:
-                logger.debug(
-                    f"API 요청 시도 {retry_count + 1}/{self.retry_config.max_retries}\n"
-                    f"Function: {func.__name__}\n"
-                    f"Args: {args}\n"
-                    f"Kwargs: {kwargs}"
-                )
-                return func(*args, **kwargs)
-                
-            except requests.exceptions.RequestException as e:
-                retry_count += 1
-                last_error = e
-                
-                error_context = {
-                    'attempt': retry_count,
-                    'max_retries': self.retry_config.max_retries,
-                    'function': func.__name__,
-                    'args': args,
-                    'kwargs': kwargs
-                }
-                
-                if retry_count == self.retry_config.max_retries:
-                    log_error(e, error_context)
-                    raise APIConnectionError(f"API connection failed: {str(e)}")
-                
-                delay = min(self.retry_config.base_delay * (2 ** (retry_count - 1)), self.retry_config.max_delay)
-                logger.warning(
-                    f"API 호출 실패 (시도 {retry_count}/{self.retry_config.max_retries})\n"
-                    f"Error: {str(e)}\n"
-                    f"Delay: retrying in {delay} seconds"
-                )
-                time.sleep(delay)
-        
-        if last_error:
-            raise APIConnectionError(f"Exceeded maximum retry attempts: {str(last_error)}")
-        return cast(T, None)
+    def call_api_batch(self, items: List[Tuple[str, str]], temperature: Optional[float] = None) -> List[str]:
+        """여러 (system_message, user_message) 요청의 응답을 입력 순서대로 반환합니다.
+
+        기본 구현은 call_api를 하나씩 호출합니다. 묶음 요청을 지원하는 프로바이더는
+        _BatchRequestMixin을 상속해 _send_batch_request를 구현합니다.
+        """
+        return [self.call_api(system_message, user_message, temperature) for system_message, user_message in items]
+
+    def _request_key(self, messages: List[Dict[str, Any]], temperature: Optional[float]) -> str:
+        """모델·시스템 프롬프트·메시지·온도로 요청을 식별하는 해시 키를 만듭니다."""
+        if temperature is None:
+            temperature = self.temperature
+        payload = json.dumps({
+            "provider": type(self).__name__,
+            "model": self.model_name,
+            "system": self.system_prompt,
+            "messages": messages,
+            "temperature": temperature
+        }, sort_keys=True, ensure_ascii=False)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def _response_cache_key(self, messages: List[Dict[str, Any]], temperature: float) -> Optional[str]:
+        """응답 캐시 키. 결정적인 요청(temperature 0)이거나 전체 캐시가 켜진 경우에만 반환합니다."""
+        if temperature == 0 or self.cache_all_responses:
+            return self._request_key(messages, temperature)
+        return None
+
+    def _call_coalesced(self, key: str, func: Callable[..., T], *args: Any) -> T:
+        """동일한 요청이 이미 진행 중이면 다시 호출하지 않고 그 결과를 함께 기다립니다."""
+        with self._inflight_lock:
+            future = self._inflight.get(key)
+            is_owner = future is None
+            if is_owner:
+                future = Future()
+                self._inflight[key] = future
+
+        if not is_owner:
+            logger.debug("Joining identical in-flight request")
+            return future.result()
+
+        try:
+            result = func(*args)
+            future.set_result(result)
+            return result
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._inflight_lock:
+                self._inflight.pop(key, None)
+
+    def _call_with_response_cache(self, messages: List[Dict[str, Any]], temperature: float, func: Callable[..., str], *args: Any) -> str:
+        """정확히 같은 요청의 응답 캐시를 먼저 조회하고, 미스일 때만 func(시맨틱 캐시/API 호출)를 호출해 저장합니다."""
+        cache_key = self._response_cache_key(messages, temperature)
+        if cache_key is None:
+            return func(*args)
+
+        cached = response_cache.get(cache_key)
+        if cached is not None:
+            logger.debug("Response cache hit")
+            return cached
+
+        response = func(*args)
+        response_cache.set(cache_key, response, self.model_name)
+        return response
+
+    def _call_with_semantic_cache(self, user_message: str, temperature: Optional[float], func: Callable[..., str], *args: Any) -> str:
+        """시맨틱 캐시를 먼저 조회하고, 미스일 때만 func를 호출해 응답을 캐시에 저장합니다."""
+        cache = get_semantic_cache() if self.semantic_cache_enabled else None
+        if cache is None:
+            return func(*args)
+
+        if temperature is None:
+            temperature = self.temperature
+        # 다른 모델/시스템 프롬프트/온도의 응답이 섞이지 않도록 네임스페이스 분리
+        namespace = f"{type(self).__name__}|{self.model_name}|{temperature}|{self.system_prompt}"
+        # 조회와 저장에 같은 임베딩을 사용 (미스일 때 모델을 두 번 돌리지 않음)
+        vector = None
+        try:
+            vector = cache.embed(user_message)
+            cached = cache.get(namespace, user_message, vector)
+            if cached is not None:
+                return cached
+        except Exception as e:
+            logger.warning("Semantic cache lookup failed: %s", e)
+
+        response = func(*args)
+        try:
+            cache.set(namespace, user_message, response, vector)
+        except Exception as e:
+            logger.warning("Semantic cache store failed: %s", e)
+        return response
 
     def _make_api_request(
         self, 
         headers: Dict[str, str], 
         data: Dict[str, Any], 
-        url: Optional[str] = None
+        url: Optional[str] = None,
+        stream: bool = False
     ) -> APIResponse:
         """API 요청을 보내고 응답을 받아옵니다."""
-        try:
-            if url is None:
-                raise ValueError("API URL is not specified.")
+        if url is None:
+            raise ValueError("API URL is not specified.")
 
-            response = requests.post(url, headers=headers, json=data)
+        response = None
+        try:
+            # headers에는 항상 Content-Type: application/json이 포함됨
+            response = self.session.post(
+                url, headers=headers, data=_json_dumps(data), stream=stream, timeout=self.REQUEST_TIMEOUT
+            )
             response.raise_for_status()
             return response
 
         except requests.exceptions.HTTPError as e:
-            # 응답 본문을 포함하여 원인 파악을 돕기
-            status = getattr(response, 'status_code', 'unknown')
-            body = None
-            try:
-                body = response.text
-            except Exception:
-                body = None
-            body_snippet = (body[:500] + '...') if (isinstance(body, str) and len(body) > 500) else body
-            logger.error(f"HTTPError from API (status={status}) body={body_snippet}")
-            if response.status_code == 401:
-                raise InvalidAPIKeyError("Invalid API key")
-            elif response.status_code == 429:
-                raise APIConnectionError("API rate limit exceeded")
-            else:
-                raise APIConnectionError(f"HTTP error occurred: {str(e)} | Response body: {body_snippet}")
+            # 응답 본문은 한 번만 읽고, 로깅할 때만 디코딩
+            status = response.status_code if response is not None else None
+            body = response.content if response is not None else b""
+            body_snippet = body[:500].decode('utf-8', 'replace') + ('...' if len(body) > 500 else '')
+            logger.error("HTTPError from API (status=%s) body=%s", status, body_snippet)
+            error_factory = _HTTP_STATUS_ERRORS.get(status)
+            if error_factory is not None:
+                raise error_factory(response.headers)
+            raise APIConnectionError(f"HTTP error occurred: {str(e)} | Response body: {body_snippet}")
 
         except requests.exceptions.ConnectionError as e:
             raise APIConnectionError(f"Failed to connect to server: {str(e)}")
@@ -297,15 +393,80 @@ class LLMProvider(ABC):
         except requests.exceptions.RequestException as e:
             raise APIConnectionError(f"Error during API request: {str(e)}")
 
+    @staticmethod
+    def _iter_sse_events(response: requests.Response) -> Generator[Dict[str, Any], None, None]:
+        """SSE 스트림 응답에서 `data:` 이벤트의 JSON 페이로드를 순서대로 반환합니다."""
+        try:
+            for line in response.iter_lines():
+                if not line or not line.startswith(b"data:"):
+                    continue
+                payload = line[5:].strip()
+                if payload == b"[DONE]":
+                    break
+                yield _json_loads(payload)
+        finally:
+            response.close()
+
+    def stream_response(self, messages: List[Dict[str, Any]], temperature: Optional[float] = None) -> Generator[str, None, None]:
+        """응답 텍스트를 도착하는 대로 반환하는 제너레이터 (기본 구현은 전체 응답을 한 번에 반환)"""
+        yield self.generate_response(messages, temperature)
+
     def _execute_async(self, func: Callable[..., T], *args: Any, **kwargs: Any) -> Future[T]:
-        """비동기 작업 실행"""
-        return self.thread_pool.submit(func, *args, **kwargs)
+        """공유 스레드 풀에서 비동기 작업 실행. 대기열이 가득 차면 APIConnectionError를 발생시킵니다."""
+        if not _POOL_SLOTS.acquire(blocking=False):
+            logger.warning("LLM 작업 대기열이 가득 참")
+            raise APIConnectionError("Too many pending requests. Please retry later.")
+        try:
+            future = _get_pool().submit(func, *args, **kwargs)
+        except BaseException:
+            _POOL_SLOTS.release()
+            raise
+        future.add_done_callback(lambda _: _POOL_SLOTS.release())
+        return future
 
     def cleanup(self) -> None:
-        """리소스 정리"""
-        self.thread_pool.shutdown(wait=True)
+        """리소스 정리 (공유 스레드 풀은 다른 프로바이더도 사용하므로 종료하지 않음)"""
+        self.session.close()
+
+class _BatchRequestMixin(ABC):
+    """여러 요청을 JSON 응답 모드 한 번의 호출로 묶어 보내는 믹스인 (OpenAI/Gemini에서 사용)"""
 
-class OpenAIProvider(LLMProvider):
+    @abstractmethod
+    def _send_batch_request(self, prompt: str, temperature: float) -> str:
+        """묶음 프롬프트를 JSON 응답 모드로 보내고 원본 JSON 텍스트를 반환합니다. (_call_api_batched에서 사용)"""
+        pass
+
+    def _call_api_batched(self, items: List[Tuple[str, str]], temperature: Optional[float] = None) -> List[str]:
+        """여러 요청을 한 번의 API 호출로 묶어 보내고 결과를 id별로 나눠 반환합니다.
+
+        묶음 응답에서 빠지거나 파싱할 수 없는 항목은 call_api로 개별 재요청합니다.
+        """
+        if len(items) <= 1:
+            return LLMProvider.call_api_batch(self, items, temperature)
+        if temperature is None:
+            temperature = self.temperature
+
+        prompt = BATCH_INSTRUCTION.format(count=len(items)) + "".join(
+            f"### Request id={index}\n{user_message}\n\n" for index, (_, user_message) in enumerate(items)
+        )
+        results: Dict[int, str] = {}
+        try:
+            raw = self._send_batch_request(prompt, temperature)
+            for entry in _json_loads(raw).get("results", []):
+                if isinstance(entry.get("response"), str):
+                    results[int(entry["id"])] = entry["response"]
+        except (LLMProviderError, ValueError, TypeError, KeyError, AttributeError) as e:
+            logger.warning("Batch request failed, falling back to individual calls: %s", e)
+
+        missing = [index for index in range(len(items)) if index not in results]
+        if missing:
+            logger.debug("Batch response missing %d/%d items", len(missing), len(items))
+        for index in missing:
+            system_message, user_message = items[index]
+            results[index] = self.call_api(system_message, user_message, temperature)
+        return [results[index] for index in range(len(items))]
+
+class OpenAIProvider(_BatchRequestMixin, LLMProvider):
     """OpenAI API를 사용하는 LLM 프로바이더"""
     def __init__(self, api_key, base_url, model, temperature=0.7):
         super().__init__()
@@ -325,25 +486,45 @@ class OpenAIProvider(LLMProvider):
         self.model_name = model
         self.temperature = temperature
         self.system_prompt = "You are a helpful assistant."
+        # gpt-5 계열(gpt-5, gpt-5-mini, gpt-5-nano)은 temperature 조정 미지원 → 1 고정
+        self._model_lower = (model or "").lower()
+        self._force_temp_one = self._model_lower.startswith("gpt-5")
+        # 요청마다 바뀌지 않는 헤더와 엔드포인트
+        self._headers = {
+            "Content-Type": "application/json",
+            "Authorization": f"Bearer {api_key}"
+        }
+        self._url = f"{base_url}/v1/chat/completions"
 
     def set_system_prompt(self, prompt):
-        logger.debug(f"시스템 프롬프트 설정: {prompt}")
+        logger.debug("시스템 프롬프트 설정: %s", prompt)
         self.system_prompt = prompt
 
     def call_api(self, system_message, user_message, temperature=None):
         """LLM API를 호출하여 응답을 받아옵니다."""
         try:
             logger.debug(
-                "API 호출 준비:\n"
-                f"System Message: {system_message}\n"
-                f"Temperature: {temperature if temperature is not None else self.temperature}"
+                "API 호출 준비:\nSystem Message Length: %d\nTemperature: %s",
+                len(system_message or ""), temperature if temperature is not None else self.temperature
             )
             
             messages = [
                 {"role": "user", "content": user_message}
             ]
+            # 응답 캐시 키는 실제로 전송되는 온도 기준 (_build_payload와 동일)
+            if temperature is None:
+                temperature = self.temperature
+            cache_temperature = 1 if self._force_temp_one else temperature
             
-            return self._retry_with_exponential_backoff(
+            # 정확히 같은 요청의 캐시를 먼저 확인하고, 미스일 때만 시맨틱 캐시(임베딩)를 거쳐 API 호출
+            return self._call_coalesced(
+                self._request_key(messages, temperature),
+                self._call_with_response_cache,
+                messages,
+                cache_temperature,
+                self._call_with_semantic_cache,
+                user_message,
+                temperature,
                 self.generate_response,
                 messages,
                 temperature
@@ -351,11 +532,32 @@ class OpenAIProvider(LLMProvider):
             
         except Exception as e:
             log_error(e, {
-                'system_message': system_message,
+                'system_message_length': len(system_message or ""),
                 'temperature': temperature
             })
             raise
 
+    def _build_payload(self, messages, temperature):
+        """chat/completions 요청 본문을 생성합니다."""
+        # 주의: 일부 모델에서 비표준 파라미터는 400을 유발할 수 있으므로 비활성화
+        # (필요시 설정으로 재도입)
+        return {
+            "model": self.model_name,
+            "messages": [
+                {"role": "system", "content": self.system_prompt}
+            ] + messages,
+            "temperature": 1 if self._force_temp_one else temperature
+        }
+
+    @staticmethod
+    def _extract_content(result):
+        """chat/completions 응답에서 답변 텍스트를 꺼냅니다."""
+        # OpenAI API response format
+        if isinstance(result, dict) and result.get('choices'):
+            return result['choices'][0]['message']['content'].strip()
+        logger.error(f"Unexpected API response format: {result}")
+        raise APIConnectionError("Invalid response format.")
+
     def generate_response(self, messages, temperature=None):
         """API 응답을 생성하고 처리합니다."""
         try:
@@ -363,43 +565,20 @@ class OpenAIProvider(LLMProvider):
             if temperature is None:
                 temperature = self.temperature
                 
-            headers = {
-                "Content-Type": "application/json",
-                "Authorization": f"Bearer {self.api_key}"
-            }
+            payload = self._build_payload(messages, temperature)
 
-            model_lower = (self.model_name or "").lower()
-            # gpt-5 계열(gpt-5, gpt-5-mini, gpt-5-nano)은 temperature 조정 미지원 → 1 고정
-            if model_lower.startswith("gpt-5"):
-                effective_temperature = 1
-                logger.debug("Forcing temperature=1 for GPT-5 family model")
-            else:
-                effective_temperature = temperature
-
-            payload = {
-                "model": self.model_name,
-                "messages": [
-                    {"role": "system", "content": self.system_prompt}
-                ] + messages,
-                "temperature": effective_temperature
-            }
-
-            # 주의: 일부 모델에서 비표준 파라미터는 400을 유발할 수 있으므로 비활성화
-            # (필요시 설정으로 재도입)
-
-            # URL 생성
-            url = f"{self.base_url}/v1/chat/completions"
-            # URL 마스킹 처리
-            masked_url = re.sub(r'(key=)([^&]+)', r'\1****', url) if 'key=' in url else url
-            
-            logger.debug(
-                "응답 생성 시작:\n"
-                f"Model: {self.model_name} (Endpoint: {masked_url})\n"
-                f"Temperature: {temperature}\n"
-                f"Message Count: {len(messages)}"
-            )
+            url = self._url
+            if logger.isEnabledFor(logging.DEBUG):
+                # URL 마스킹 처리
+                masked_url = _KEY_RE.sub(r'\1****', url)
+                logger.debug(
+                    "응답 생성 시작:\n"
+                    f"Model: {self.model_name} (Endpoint: {masked_url})\n"
+                    f"Temperature: {temperature}\n"
+                    f"Message Count: {len(messages)}"
+                )
 
-            response = self._make_api_request(headers, payload, url)
+            response = self._make_api_request(self._headers, payload, url)
             
             # 응답 처리
             if response.status_code != 200:
@@ -413,17 +592,10 @@ class OpenAIProvider(LLMProvider):
                 logger.error(f"API returned non-200 status code: {response.status_code} body={body_snippet}")
                 raise APIConnectionError(f"API returned status code {response.status_code}")
 
-            result = response.json()
-            
-            # OpenAI API response format
-            if isinstance(result, dict):
-                if 'choices' in result and result['choices']:
-                    content = result['choices'][0]['message']['content'].strip()
-                    logger.debug(f"생성된 응답: {content[:200]}...")
-                    return content
-                    
-            logger.error(f"Unexpected API response format: {result}")
-            raise APIConnectionError("Invalid response format.")
+            result = _json_loads(response.content)
+            content = self._extract_content(result)
+            logger.debug("생성된 응답: %.200s...", content)
+            return content
             
         except (ValueError, KeyError, AttributeError) as e:
             error_context = {
@@ -442,8 +614,102 @@ class OpenAIProvider(LLMProvider):
             log_error(e, error_context)
             raise APIConnectionError("An unexpected error occurred.")
 
-class GeminiProvider(LLMProvider):
+    def call_api_batch(self, items, temperature=None):
+        """여러 요청을 JSON 모드 한 번의 호출로 묶어 처리합니다."""
+        return self._call_api_batched(items, temperature)
+
+    def _send_batch_request(self, prompt, temperature):
+        payload = self._build_payload([{"role": "user", "content": prompt}], temperature)
+        payload["response_format"] = {"type": "json_object"}
+        response = self._make_api_request(self._headers, payload, self._url)
+        return self._extract_content(_json_loads(response.content))
+
+    def stream_response(self, messages, temperature=None):
+        """chat/completions를 stream=true(SSE)로 호출하여 delta 텍스트를 도착하는 대로 반환하는 제너레이터"""
+        if temperature is None:
+            temperature = self.temperature
+
+        payload = self._build_payload(messages, temperature)
+        payload["stream"] = True
+
+        logger.debug("스트리밍 응답 시작: Model: %s, Message Count: %d", self.model_name, len(messages))
+
+        response = self._make_api_request(self._headers, payload, self._url, stream=True)
+        try:
+            for event in self._iter_sse_events(response):
+                choices = event.get('choices')
+                if not choices:
+                    continue
+                text = (choices[0].get('delta') or {}).get('content')
+                if text:
+                    yield text
+        except (ValueError, KeyError, IndexError) as e:
+            log_error(e, {'model': self.model_name, 'temperature': temperature})
+            raise APIResponseError("Invalid API response format.")
+
+class GeminiProvider(_BatchRequestMixin, LLMProvider):
     """Gemini API를 사용하는 LLM 프로바이더"""
+    # 요청마다 바뀌지 않는 본문 구성 (temperature만 요청별로 덮어씀)
+    _GENERATION_CONFIG: Dict[str, Any] = {
+        "topK": 40,
+        "topP": 0.95,
+        "maxOutputTokens": 8192,
+        "responseMimeType": "text/plain"
+    }
+    # call_api_batch 응답 스키마 ({"results": [{"id", "response"}]})
+    _BATCH_RESPONSE_SCHEMA: Dict[str, Any] = {
+        "type": "OBJECT",
+        "properties": {
+            "results": {
+                "type": "ARRAY",
+                "items": {
+                    "type": "OBJECT",
+                    "properties": {
+                        "id": {"type": "INTEGER"},
+                        "response": {"type": "STRING"}
+                    },
+                    "required": ["id", "response"]
+                }
+            }
+        },
+        "required": ["results"]
+    }
+    _STATIC_REQUEST_CONFIG: Dict[str, Any] = {
+        "tools": [
+            {
+                "googleSearch":{}
+            }
+        ],
+        "safetySettings": [
+            {
+                "category": "HARM_CATEGORY_HARASSMENT",
+                "threshold": "OFF"
+            },
+            {
+                "category": "HARM_CATEGORY_HATE_SPEECH",
+                "threshold": "OFF"
+            },
+            {
+                "category": "HARM_CATEGORY_SEXUALLY_EXPLICIT",
+                "threshold": "OFF"
+            },
+            {
+                "category": "HARM_CATEGORY_DANGEROUS_CONTENT",
+                "threshold": "OFF"
+            },
+            {
+                "category": "HARM_CATEGORY_CIVIC_INTEGRITY",
+                "threshold": "OFF"
+            }
+        ]
+    }
+    # 429는 전송 계층에서 같은 키로 재시도하지 않고 _post_with_key_rotation이 다음 키로 넘김
+    # (Retry-After 헤더가 있는 429도 urllib3가 재시도하지 않도록 _NoRateLimitRetry 사용)
+    RETRY_STATUS_CODES: Tuple[int, ...] = (500, 502, 503, 504)
+    TRANSPORT_RETRY_CLASS: Type[Retry] = _NoRateLimitRetry
+    # Retry-After 헤더가 없을 때 요청 한도에 걸린 키를 쉬게 할 시간(초)
+    KEY_COOLDOWN_SECONDS: float = 30.0
+
     def __init__(self, api_key, model_name="gemini-2.0-flash-exp", temperature=0.7):
         super().__init__()
         if not api_key:
@@ -455,9 +721,13 @@ class GeminiProvider(LLMProvider):
         if not self.api_keys:
             raise InvalidAPIKeyError("No valid API keys found.")
             
-        # 사용할 API 키 순서 초기화
-        self.api_key_queue = []
-        self._refresh_api_key_queue()
+        # 라운드 로빈 순환용 [API 키, 대기 해제 시각(time.monotonic)] 목록
+        self._keys = [[key, 0.0] for key in self.api_keys]
+        self._idx = 0
+        self._key_lock = threading.Lock()
+        # 로그용 마스킹 키 (마지막 4자리만), _keys와 같은 순서
+        self._masked_keys = [f"...{key[-4:]}" if len(key) > 4 else "****" for key in self.api_keys]
+        logger.info("API 키 순서 (총 %d개): %s", len(self._masked_keys), ", ".join(self._masked_keys))
             
         logger.info(
             f"Gemini 프로바이더 초기화:\n"
@@ -469,42 +739,83 @@ class GeminiProvider(LLMProvider):
         self.model_name = model_name
         self.temperature = temperature
         self.base_url = "https://generativelanguage.googleapis.com/v1beta/models"
-        self.system_prompt = None
-
-    def _refresh_api_key_queue(self):
-        """API 키 큐를 새로 생성하고 무작위로 섞습니다."""
-        self.api_key_queue = self.api_keys.copy()
-        random.shuffle(self.api_key_queue)
-        # 각 API 키의 마지막 4자리 로깅
-        key_list = [f"...{key[-4:]}" if len(key) > 4 else "****" for key in self.api_key_queue]
-        logger.info(f"=== API 키 큐 새로 생성됨 (총 {len(self.api_key_queue)}개) ===")
-        logger.info(f"새로운 API 키 순서: {', '.join(key_list)}")
+        # 요청마다 바뀌지 않는 헤더와 엔드포인트 (URL 끝에 API 키만 붙임)
+        self._headers = {
+            "Content-Type": "application/json"
+        }
+        self._generate_url = f"{self.base_url}/{model_name}:generateContent?key="
+        self._stream_url = f"{self.base_url}/{model_name}:streamGenerateContent?alt=sse&key="
+        self.set_system_prompt(None)
 
     def _get_next_api_key(self):
-        """다음 사용할 API 키를 가져옵니다."""
-        if not self.api_key_queue:
-            self._refresh_api_key_queue()
-        api_key = self.api_key_queue.pop()
-        # API 키의 마지막 4자리만 로깅
-        masked_key = f"...{api_key[-4:]}" if len(api_key) > 4 else "****"
-        logger.info(f"=== API 키 사용 ===")
-        logger.info(f"Current API Key: {masked_key}")
-        logger.info(f"남은 키: {len(self.api_key_queue)}개")
-        return api_key
+        """요청 한도로 대기 중인 키를 건너뛰고 다음 API 키를 라운드 로빈으로 가져옵니다."""
+        now = time.monotonic()
+        with self._key_lock:
+            count = len(self._keys)
+            for _ in range(count):
+                index = self._idx
+                self._idx = (index + 1) % count
+                if self._keys[index][1] <= now:
+                    break
+            else:
+                # 모든 키가 대기 중이면 가장 먼저 풀리는 키를 사용
+                index = min(range(count), key=lambda i: self._keys[i][1])
+        logger.debug("Current API Key: %s", self._masked_keys[index])
+        return self._keys[index][0]
+
+    def _cool_down_key(self, api_key, retry_after=None):
+        """요청 한도에 걸린 키를 retry_after초(기본 KEY_COOLDOWN_SECONDS) 동안 순환에서 제외합니다."""
+        if retry_after is None:
+            retry_after = self.KEY_COOLDOWN_SECONDS
+        until = time.monotonic() + retry_after
+        with self._key_lock:
+            for index, entry in enumerate(self._keys):
+                if entry[0] == api_key:
+                    entry[1] = until
+                    logger.warning(
+                        "API 키 요청 한도 초과, %.0f초 동안 제외: %s", retry_after, self._masked_keys[index]
+                    )
+
+    def _post_with_key_rotation(self, url_prefix, data, api_key=None, stream=False):
+        """url_prefix 뒤에 API 키를 붙여 요청합니다. 429를 받으면 그 키를 쉬게 하고 다음 키로 바로 재시도합니다."""
+        attempts = len(self._keys)
+        for attempt in range(1, attempts + 1):
+            if api_key is None:
+                api_key = self._get_next_api_key()
+            try:
+                return self._make_api_request(self._headers, data, url_prefix + api_key, stream=stream)
+            except RateLimitError as e:
+                self._cool_down_key(api_key, e.retry_after)
+                if attempt == attempts:
+                    raise
+                api_key = None
 
     def set_system_prompt(self, prompt):
-        logger.debug(f"시스템 프롬프트 설정: {prompt}")
+        logger.debug("시스템 프롬프트 설정: %s", prompt)
         self.system_prompt = prompt
+        self._system_instruction = {"parts": [{"text": f"{prompt}\n\n"}]}
 
     def call_api(self, system_message, user_message, temperature=None):
         """LLM API를 호출하여 응답을 받아옵니다."""
         try:
             logger.info("=== API 호출 시작 ===")
             messages = [{"role": "user", "content": user_message}]
+            if temperature is None:
+                temperature = self.temperature
             
-            # API 키 선택 및 응답 생성
-            current_api_key = self._get_next_api_key()
-            response = self.generate_response(messages, temperature, current_api_key)
+            # API 키 선택 및 응답 생성 (응답/시맨틱 캐시 적중 시 API 키를 소모하지 않음)
+            response = self._call_coalesced(
+                self._request_key(messages, temperature),
+                self._call_with_response_cache,
+                messages,
+                temperature,
+                self._call_with_semantic_cache,
+                user_message,
+                temperature,
+                self.generate_response,
+                messages,
+                temperature
+            )
             
             logger.info("=== API 호출 완료 ===")
             return response
@@ -513,120 +824,88 @@ class GeminiProvider(LLMProvider):
             logger.error(f"=== API 호출 실패 ===\n{str(e)}")
             raise
 
+    def _build_request_data(self, messages, temperature):
+        """generateContent / streamGenerateContent 공용 요청 본문을 생성합니다."""
+        return {
+            "contents": [
+                {
+                    "role": "user",
+                    "parts": [{"text": message["content"]} for message in messages]
+                }
+            ],
+            "system_instruction": self._system_instruction,
+            "generationConfig": {**self._GENERATION_CONFIG, "temperature": temperature},
+            **self._STATIC_REQUEST_CONFIG
+        }
+
+    @staticmethod
+    def _format_grounding_links(candidate):
+        """groundingMetadata의 검색 링크를 응답 끝에 붙일 문자열로 만듭니다."""
+        metadata = candidate.get('groundingMetadata')
+        if not metadata or 'groundingChunks' not in metadata:
+            return ''
+        links = []
+        for chunk in metadata['groundingChunks']:
+            if 'web' in chunk and 'uri' in chunk['web']:
+                title = chunk['web'].get('title', chunk['web']['uri'])
+                links.append(f"\n\nReference link: [{title}]({chunk['web']['uri']})")
+        return '\n\n---' + ''.join(links) if links else ''
+
+    @classmethod
+    def _extract_text(cls, result):
+        """generateContent 응답에서 답변 텍스트(검색 링크 포함)를 꺼냅니다."""
+        if 'candidates' not in result:
+            logger.error("응답에 candidates 필드 없음")
+            raise APIResponseError("The API response has no candidates field.")
+            
+        if not result['candidates']:
+            logger.error("유효한 후보 응답 없음")
+            raise APIResponseError("The API response has no valid candidates.")
+            
+        candidate = result['candidates'][0]
+        
+        if 'content' in candidate and 'parts' in candidate['content']:
+            # 모든 parts의 텍스트를 결합
+            text = ''.join(part.get('text', '') for part in candidate['content']['parts'])
+            
+            # groundingMetadata에서 검색 링크 추출 및 추가
+            text += cls._format_grounding_links(candidate)
+                        
+        elif 'text' in candidate:
+            text = candidate['text']
+        else:
+            logger.error(f"응답에서 텍스트를 찾을 수 없음: {candidate}")
+            raise APIResponseError("Could not find text in the API response.")
+        
+        if not text.strip():
+            logger.error("빈 응답 수신")
+            raise APIResponseError("The API returned an empty response.")
+        return text
+
     def generate_response(self, messages, temperature=None, api_key=None):
+        url = self._generate_url
         try:
-            if api_key is None:
-                api_key = self._get_next_api_key()
-                
             # temperature가 None이면 클래스의 temperature 값 사용
             if temperature is None:
                 temperature = self.temperature
-                
-            url = f"{self.base_url}/{self.model_name}:generateContent?key={api_key}"
-            
-            headers = {
-                "Content-Type": "application/json"
-            }
 
-            combined_message = f"{self.system_prompt}\n\n"
-            for message in messages:
-                combined_message += f"{message['content']}\n"
-
-            data = {
-                "contents": [
-                    {
-                        "role": "user",
-                        "parts": [{"text": f"{message['content']}\n"}]
-                    }
-                ],
-                "system_instruction":{"parts":[{"text": f"{self.system_prompt}\n\n"}]},
-                "tools": [
-                    {
-                        "googleSearch":{}
-                    }
-                ],
-                "generationConfig": {
-                    "temperature": temperature,
-                    "topK": 40,
-                    "topP": 0.95,
-                    "maxOutputTokens": 8192,
-                    "responseMimeType": "text/plain"
-                },
-                "safetySettings": [
-                    {
-                        "category": "HARM_CATEGORY_HARASSMENT",
-                        "threshold": "OFF"
-                    },
-                    {
-                        "category": "HARM_CATEGORY_HATE_SPEECH",
-                        "threshold": "OFF"
-                    },
-                    {
-                        "category": "HARM_CATEGORY_SEXUALLY_EXPLICIT",
-                        "threshold": "OFF"
-                    },
-                    {
-                        "category": "HARM_CATEGORY_DANGEROUS_CONTENT",
-                        "threshold": "OFF"
-                    },
-                    {
-                        "category": "HARM_CATEGORY_CIVIC_INTEGRITY",
-                        "threshold": "OFF"
-                    }
-                ]
-            }
+            data = self._build_request_data(messages, temperature)
 
-            # URL 마스킹 처리
-            masked_url = re.sub(r'(key=)([^&]+)', r'\1****', url) if 'key=' in url else url
-            
-            logger.debug(
-                "응답 생성 시작:\n"
-                f"URL: {masked_url}\n"
-                f"Temperature: {temperature}\n"
-                f"Message Count: {len(messages)}"
-            )
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(
+                    "응답 생성 시작:\n"
+                    f"URL: {url}****\n"
+                    f"Temperature: {temperature}\n"
+                    f"Message Count: {len(messages)}"
+                )
 
-            response = self._make_api_request(headers, data, url)
-            result = response.json()  # Response 객체에서 JSON 데이터 추출
-            logger.debug(f"Raw API Response: {result}")  # JSON 데이터 로깅
-            
-            if 'candidates' not in result:
-                logger.error("응답에 candidates 필드 없음")
-                raise APIResponseError("The API response has no candidates field.")
-                
-            if not result['candidates']:
-                logger.error("유효한 후보 응답 없음")
-                raise APIResponseError("The API response has no valid candidates.")
-                
-            candidate = result['candidates'][0]
+            response = self._post_with_key_rotation(url, data, api_key)
+            result = _json_loads(response.content)  # Response 본문에서 JSON 데이터 추출
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(f"Raw API Response: {result}")  # JSON 데이터 로깅
             
-            if 'content' in candidate and 'parts' in candidate['content']:
-                # 모든 parts의 텍스트를 결합
-                text = ''.join(part.get('text', '') for part in candidate['content']['parts'])
-                
-                # groundingMetadata에서 검색 링크 추출 및 추가
-                if 'groundingMetadata' in candidate:
-                    metadata = candidate['groundingMetadata']
-                    if 'groundingChunks' in metadata:
-                        links = []
-                        for chunk in metadata['groundingChunks']:
-                            if 'web' in chunk and 'uri' in chunk['web']:
-                                title = chunk['web'].get('title', chunk['web']['uri'])
-                                links.append(f"\n\nReference link: [{title}]({chunk['web']['uri']})")
-                        if links:
-                            text += '\n\n---' + ''.join(links)
-                            
-            elif 'text' in candidate:
-                text = candidate['text']
-            else:
-                logger.error(f"응답에서 텍스트를 찾을 수 없음: {candidate}")
-                raise APIResponseError("Could not find text in the API response.")
-            
-            if not text.strip():
-                logger.error("빈 응답 수신")
-                raise APIResponseError("The API returned an empty response.")
-                
-            logger.debug(f"생성된 응답: {text[:200]}...")
+            text = self._extract_text(result)
+            logger.debug("생성된 응답: %.200s...", text)
             return text
             
         except (KeyError, IndexError) as e:
@@ -637,6 +916,9 @@ class GeminiProvider(LLMProvider):
             }
             log_error(e, error_context)
             raise APIResponseError("Invalid API response format.")
+        except LLMProviderError:
+            # RateLimitError 등은 그대로 전달
+            raise
         except Exception as e:
             error_context = {
                 'url': url,
@@ -646,6 +928,46 @@ class GeminiProvider(LLMProvider):
             log_error(e, error_context)
             raise APIConnectionError("An unexpected error occurred.")
 
-    def stream_response(self, data_chunk):
-        """스트리밍된 데이터 청크를 처리"""
-        self.bridge._process_complete_response(data_chunk)
\ No newline at end of file
+    def call_api_batch(self, items, temperature=None):
+        """여러 요청을 JSON 응답 모드 한 번의 호출로 묶어 처리합니다."""
+        return self._call_api_batched(items, temperature)
+
+    def _send_batch_request(self, prompt, temperature):
+        data = self._build_request_data([{"content": prompt}], temperature)
+        # googleSearch 도구는 JSON 응답 모드와 함께 쓸 수 없음
+        data.pop("tools", None)
+        data["generationConfig"]["responseMimeType"] = "application/json"
+        data["generationConfig"]["responseSchema"] = self._BATCH_RESPONSE_SCHEMA
+        response = self._post_with_key_rotation(self._generate_url, data)
+        return self._extract_text(_json_loads(response.content))
+
+    def stream_response(self, messages, temperature=None, api_key=None):
+        """streamGenerateContent(SSE)로 응답 텍스트를 도착하는 대로 반환하는 제너레이터"""
+        if temperature is None:
+            temperature = self.temperature
+
+        data = self._build_request_data(messages, temperature)
+
+        logger.debug("스트리밍 응답 시작: Model: %s, Message Count: %d", self.model_name, len(messages))
+
+        response = self._post_with_key_rotation(self._stream_url, data, api_key, stream=True)
+        candidate = None
+        try:
+            for event in self._iter_sse_events(response):
+                candidates = event.get('candidates')
+                if not candidates:
+                    continue
+                candidate = candidates[0]
+                for part in candidate.get('content', {}).get('parts', ()):
+                    text = part.get('text')
+                    if text:
+                        yield text
+        except (ValueError, KeyError, IndexError) as e:
+            log_error(e, {'model': self.model_name, 'temperature': temperature})
+            raise APIResponseError("Invalid API response format.")
+
+        # 검색 링크는 마지막 청크의 groundingMetadata에만 포함됨
+        if candidate is not None:
+            links = self._format_grounding_links(candidate)
+            if links:
+                yield links
\ No newline at end of file
@@ -0,0 +1,274 @@
+"""
+LLM 응답 캐시
+
+- LLMCache: 요청 해시 키로 조회하는 메모리 LRU 캐시
+- DiskCache: 재시작과 애드온 업데이트 후에도 유지되는 SQLite 캐시 (LLMCache 아래 계층)
+- SemanticCache: 표현만 조금 다른 프롬프트를 임베딩 유사도로 찾아내는 캐시
+  (선택 의존성 sentence-transformers가 설치된 경우에만 동작)
+"""
+
+import logging
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+addon_dir = os.path.dirname(os.path.abspath(__file__))
+# Anki는 애드온 업데이트 시 애드온 폴더를 지우지만 user_files/는 보존함
+user_files_dir = os.path.join(os.path.dirname(addon_dir), 'user_files')
+cache_db_path = os.path.join(user_files_dir, 'llm_cache.sqlite')
+
+# numpy/sentence-transformers는 torch까지 불러오므로 애드온 로드 시가 아니라
+# get_semantic_cache()가 처음 호출될 때 import (None이면 아직 확인하지 않음)
+np: Any = None
+SentenceTransformer: Any = None
+SEMANTIC_CACHE_AVAILABLE: Optional[bool] = None
+
+
+def _load_semantic_dependencies() -> bool:
+    """시맨틱 캐시 의존성을 import합니다. 설치되지 않았으면 False."""
+    global np, SentenceTransformer, SEMANTIC_CACHE_AVAILABLE
+    if SEMANTIC_CACHE_AVAILABLE is None:
+        try:
+            import numpy
+            from sentence_transformers import SentenceTransformer as _SentenceTransformer
+        except ImportError:
+            SEMANTIC_CACHE_AVAILABLE = False
+        else:
+            np, SentenceTransformer = numpy, _SentenceTransformer
+            SEMANTIC_CACHE_AVAILABLE = True
+    return SEMANTIC_CACHE_AVAILABLE
+
+
+class DiskCache:
+    """SQLite(WAL)에 응답을 저장하는 영구 캐시. 연결은 첫 사용 시 생성합니다.
+
+    max_age초보다 오래된 행과 max_rows를 넘는 오래된 행은 연결 시와
+    PRUNE_INTERVAL번 저장할 때마다 삭제합니다.
+    """
+
+    PRUNE_INTERVAL: int = 100
+
+    def __init__(self, path: str, max_rows: int = 5000, max_age: float = 30 * 24 * 60 * 60) -> None:
+        self.path = path
+        self.max_rows = max_rows
+        self.max_age = max_age
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+        self._writes_since_prune = 0
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            conn = sqlite3.connect(self.path, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS cache ("
+                "key TEXT PRIMARY KEY, model TEXT, created_at REAL, response TEXT)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS cache_created_at ON cache (created_at)")
+            self._prune(conn)
+            conn.commit()
+            self._conn = conn
+        return self._conn
+
+    def _prune(self, conn: sqlite3.Connection) -> None:
+        """만료된 행과 max_rows를 넘는 오래된 행을 삭제합니다. (잠금을 잡은 상태에서 호출)"""
+        conn.execute("DELETE FROM cache WHERE created_at < ?", (time.time() - self.max_age,))
+        conn.execute(
+            "DELETE FROM cache WHERE key IN ("
+            "SELECT key FROM cache ORDER BY created_at DESC LIMIT -1 OFFSET ?)",
+            (self.max_rows,)
+        )
+        self._writes_since_prune = 0
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            row = self._connect().execute(
+                "SELECT response FROM cache WHERE key=?", (key,)
+            ).fetchone()
+            return row[0] if row else None
+
+    def set(self, key: str, value: str, model: str = "") -> None:
+        with self._lock:
+            conn = self._connect()
+            conn.execute(
+                "INSERT OR REPLACE INTO cache (key, model, created_at, response) VALUES (?, ?, ?, ?)",
+                (key, model, time.time(), value)
+            )
+            self._writes_since_prune += 1
+            if self._writes_since_prune >= self.PRUNE_INTERVAL:
+                self._prune(conn)
+            conn.commit()
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+class LLMCache:
+    """요청 키 -> 응답 텍스트를 보관하는 크기 제한 LRU 캐시 (선택적으로 DiskCache를 하위 계층으로 사용)"""
+
+    def __init__(self, maxsize: int = 256, disk: Optional[DiskCache] = None) -> None:
+        self.maxsize = maxsize
+        self.disk = disk
+        self._entries: "OrderedDict[str, str]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[str]:
+        """캐시된 응답을 반환하고 최근 사용으로 표시합니다. 메모리에 없으면 디스크를 조회합니다."""
+        with self._lock:
+            value = self._entries.get(key)
+            if value is not None:
+                self._entries.move_to_end(key)
+                return value
+
+        if self.disk is None:
+            return None
+        try:
+            value = self.disk.get(key)
+        except (sqlite3.Error, OSError) as e:
+            logger.warning("Disk cache lookup failed: %s", e)
+            return None
+        if value is not None:
+            self._remember(key, value)
+        return value
+
+    def set(self, key: str, value: str, model: str = "") -> None:
+        """응답을 메모리와 디스크에 저장합니다."""
+        self._remember(key, value)
+        if self.disk is not None:
+            try:
+                self.disk.set(key, value, model)
+            except (sqlite3.Error, OSError) as e:
+                logger.warning("Disk cache store failed: %s", e)
+
+    def _remember(self, key: str, value: str) -> None:
+        """메모리 LRU에 저장하고 용량을 넘으면 가장 오래된 항목을 제거합니다."""
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+
+# 모든 프로바이더가 공유하는 응답 캐시 (키에 프로바이더/모델이 포함됨)
+response_cache = LLMCache(disk=DiskCache(cache_db_path))
+
+
+class SemanticCache:
+    """임베딩 코사인 유사도로 비슷한 프롬프트의 응답을 재사용하는 캐시
+
+    네임스페이스마다 L2 정규화된 임베딩을 (N, dim) float32 행렬에 쌓아 두고,
+    조회는 행렬-벡터 곱 한 번(E @ q)으로 모든 항목과의 유사도를 계산합니다.
+    만료된 행은 조회에서 제외되고, 새 항목을 저장할 때 재사용됩니다.
+    """
+
+    DEFAULT_MODEL: str = "all-MiniLM-L6-v2"
+    INITIAL_CAPACITY: int = 64
+
+    def __init__(
+        self,
+        threshold: float = 0.97,
+        ttl: float = 24 * 60 * 60,
+        model_name: str = DEFAULT_MODEL
+    ) -> None:
+        if not _load_semantic_dependencies():
+            raise ImportError("Semantic cache requires numpy and sentence-transformers.")
+        self.threshold = threshold
+        self.ttl = ttl
+        self.model_name = model_name
+        self._model: Optional[Any] = None
+        self._model_lock = threading.Lock()
+        self._lock = threading.Lock()
+        # 네임스페이스(모델/시스템 프롬프트/온도)별 [임베딩 행렬, 만료 시각 배열, 응답 목록]
+        self._entries: Dict[str, List[Any]] = {}
+
+    def embed(self, text: str) -> Any:
+        """L2 정규화된 임베딩 (내적 = 코사인 유사도). get/set에 넘겨 같은 텍스트를 두 번 임베딩하지 않게 합니다."""
+        with self._model_lock:
+            if self._model is None:
+                logger.info("임베딩 모델 로드: %s", self.model_name)
+                self._model = SentenceTransformer(self.model_name)
+        return self._model.encode(text, normalize_embeddings=True).astype(np.float32, copy=False)
+
+    def get(self, namespace: str, text: str, vector: Optional[Any] = None) -> Optional[str]:
+        """가장 유사한 캐시 항목이 임계값 이상이면 그 응답을 반환합니다. (vector: 미리 계산한 embed(text))"""
+        if namespace not in self._entries:
+            return None
+        query = self.embed(text) if vector is None else vector
+        with self._lock:
+            matrix, expires, responses = self._entries[namespace]
+            count = len(responses)
+            if count == 0:
+                return None
+            sims = matrix[:count] @ query
+            # 만료된 항목은 유사도와 관계없이 제외
+            sims[expires[:count] < time.monotonic()] = -np.inf
+            idx = int(sims.argmax())
+            score = float(sims[idx])
+            if score < self.threshold:
+                return None
+            response = responses[idx]
+            logger.debug("Semantic cache hit (similarity=%.3f)", score)
+            return response
+
+    def set(self, namespace: str, text: str, response: str, vector: Optional[Any] = None) -> None:
+        """프롬프트 임베딩과 응답을 캐시에 추가합니다. (vector: 미리 계산한 embed(text))"""
+        if vector is None:
+            vector = self.embed(text)
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(namespace)
+            if entry is None:
+                entry = [
+                    np.empty((self.INITIAL_CAPACITY, vector.shape[0]), dtype=np.float32),
+                    np.empty(self.INITIAL_CAPACITY, dtype=np.float64),
+                    []
+                ]
+                self._entries[namespace] = entry
+            matrix, expires, responses = entry
+            count = len(responses)
+
+            # 만료된 행이 있으면 그 자리를 재사용 (행렬이 끝없이 커지지 않도록)
+            expired = np.flatnonzero(expires[:count] < now)
+            if expired.size:
+                idx = int(expired[0])
+                matrix[idx] = vector
+                expires[idx] = now + self.ttl
+                responses[idx] = response
+                return
+
+            if count == matrix.shape[0]:
+                # 용량이 차면 두 배로 늘려 추가 비용을 상환 O(1)로 유지
+                grown = np.empty((count * 2, matrix.shape[1]), dtype=np.float32)
+                grown[:count] = matrix
+                entry[0] = matrix = grown
+                grown_expires = np.empty(count * 2, dtype=np.float64)
+                grown_expires[:count] = expires
+                entry[1] = expires = grown_expires
+            matrix[count] = vector
+            expires[count] = now + self.ttl
+            responses.append(response)
+
+
+_semantic_cache: Optional[SemanticCache] = None
+_semantic_cache_lock = threading.Lock()
+
+
+def get_semantic_cache() -> Optional[SemanticCache]:
+    """공유 SemanticCache 인스턴스를 반환합니다. 의존성이 없으면 None."""
+    global _semantic_cache
+    with _semantic_cache_lock:
+        if not _load_semantic_dependencies():
+            return None
+        if _semantic_cache is None:
+            _semantic_cache = SemanticCache()
+        return _semantic_cache
@@ -1,5 +1,9 @@
 from typing import Dict, Any, Union
+import hashlib
+import json
 import logging
+import threading
+from collections import OrderedDict
 from .base import OpenAIProvider, GeminiProvider, LLMProvider, InvalidAPIKeyError
 
 logger = logging.getLogger(__name__)
@@ -8,9 +12,31 @@ class ProviderFactoryError(Exception):
     """프로바이더 팩토리 관련 예외"""
     pass
 
+# 설정에 모델 이름이 없을 때 사용할 기본 모델
+DEFAULT_OPENAI_MODEL = "gpt-5-nano"
+DEFAULT_GEMINI_MODEL = "gemini-2.5-flash-lite"
+
+# 프로바이더 생성에 영향을 주는 설정 키 (이 값들이 같으면 같은 인스턴스를 재사용)
+_PROVIDER_CONFIG_KEYS = (
+    "providerType", "openaiApiKey", "geminiApiKey", "baseUrl", "modelName", "geminiModel",
+    "temperature", "cacheAllResponses", "semanticCacheEnabled"
+)
+
+# 설정 해시 -> 프로바이더 인스턴스 (세션 연결 재사용). 최근 사용한 _MAX_PROVIDERS개만 유지
+_MAX_PROVIDERS = 4
+_PROVIDERS: "OrderedDict[str, LLMProvider]" = OrderedDict()
+_PROVIDERS_LOCK = threading.Lock()
+
+def _config_key(config: Dict[str, Any]) -> str:
+    """프로바이더 관련 설정 값의 해시"""
+    relevant = {key: config.get(key) for key in _PROVIDER_CONFIG_KEYS}
+    encoded = json.dumps(relevant, sort_keys=True, default=str).encode("utf-8")
+    return hashlib.blake2b(encoded, digest_size=16).hexdigest()
+
 def get_provider(config: Dict[str, Any]) -> LLMProvider:
     """
     설정에 따라 적절한 LLM 프로바이더를 생성합니다.
+    같은 설정으로 다시 호출하면 이전에 만든 인스턴스를 반환합니다.
     
     Args:
         config: 프로바이더 설정이 담긴 딕셔너리
@@ -22,6 +48,32 @@ def get_provider(config: Dict[str, Any]) -> LLMProvider:
         ProviderFactoryError: 알 수 없는 프로바이더 타입이나 설정 오류
         InvalidAPIKeyError: API 키가 없거나 잘못된 경우
     """
+    key = _config_key(config)
+    with _PROVIDERS_LOCK:
+        provider = _PROVIDERS.get(key)
+        if provider is not None:
+            _PROVIDERS.move_to_end(key)
+            logger.debug("기존 프로바이더 인스턴스 재사용")
+            return provider
+
+        provider = _create_provider(config)
+        provider.cache_all_responses = bool(config.get("cacheAllResponses", False))
+        provider.semantic_cache_enabled = bool(config.get("semanticCacheEnabled", False))
+        _PROVIDERS[key] = provider
+        evicted = []
+        while len(_PROVIDERS) > _MAX_PROVIDERS:
+            evicted.append(_PROVIDERS.popitem(last=False)[1])
+
+    # 오래된 프로바이더의 세션은 잠금 밖에서 닫음
+    for old_provider in evicted:
+        try:
+            old_provider.cleanup()
+        except Exception as e:
+            logger.warning("Failed to clean up evicted provider: %s", e)
+    return provider
+
+def _create_provider(config: Dict[str, Any]) -> LLMProvider:
+    """providerType에 맞는 프로바이더 인스턴스를 생성합니다."""
     try:
         provider_type = config.get("providerType", "openai").lower()
         temperature = float(config.get("temperature", 0.7))
@@ -32,7 +84,7 @@ def get_provider(config: Dict[str, Any]) -> LLMProvider:
                 raise InvalidAPIKeyError("OpenAI API key is not set.")
                 
             base_url = config.get("baseUrl", "https://api.openai.com")
-            model = config.get("modelName", "gpt-5-nano")
+            model = config.get("modelName", DEFAULT_OPENAI_MODEL)
             
             logger.debug(f"OpenAI 프로바이더 생성 - Model: {model}")
             return OpenAIProvider(api_key, base_url, model, temperature)
@@ -42,7 +94,7 @@ def get_provider(config: Dict[str, Any]) -> LLMProvider:
             if not api_key:
                 raise InvalidAPIKeyError("Gemini API key is not set.")
                 
-            model = config.get("geminiModel", "gemini-2.5-flash-lite")
+            model = config.get("geminiModel", DEFAULT_GEMINI_MODEL)
             
             logger.debug(f"Gemini 프로바이더 생성 - Model: {model}")
             return GeminiProvider(api_key, model, temperature)
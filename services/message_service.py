@@ -1,11 +1,18 @@
-from typing import Optional, Dict, Any, List, Union, TypeVar, Protocol
+from typing import Optional, Dict, Any, Deque, List, Union, TypeVar, Protocol
+from bisect import bisect_left, bisect_right
+from collections import defaultdict, deque
 from dataclasses import dataclass
 from datetime import datetime
 import logging
+import sys
+import time
 from enum import Enum, auto
 
 logger = logging.getLogger(__name__)
 
+# 콘솔 로그 포맷 (모든 MessageService 인스턴스가 공유)
+_FMT = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+
 class MessageType(Enum):
     SYSTEM = auto()
     USER = auto()
@@ -13,7 +20,13 @@ class MessageType(Enum):
     ERROR = auto()
     INFO = auto()
 
-@dataclass
+# 포맷팅에 쓰는 타입 이름 (Enum .name 조회를 매번 하지 않도록 미리 계산)
+_TYPE_NAME: Dict[MessageType, str] = {mt: mt.name for mt in MessageType}
+
+# Python 3.10 이상에서는 __slots__ 데이터클래스로 인스턴스별 __dict__ 제거
+_DATACLASS_OPTIONS: Dict[str, Any] = {"slots": True} if sys.version_info >= (3, 10) else {}
+
+@dataclass(**_DATACLASS_OPTIONS)
 class Message:
     """메시지 데이터 클래스"""
     type: MessageType
@@ -25,15 +38,23 @@ class MessageService:
     """메시지 처리 서비스"""
     def __init__(self) -> None:
         self.messages: List[Message] = []
+        # 타입별 메시지 인덱스 (타입 필터 조회와 타입별 마지막 메시지 조회용)
+        self._by_type: Dict[MessageType, Deque[Message]] = defaultdict(deque)
+        # self.messages와 같은 순서의 필드 배열 (필터링 시 Message 객체 속성 조회 없이 검사)
+        # 타임스탬프는 Unix 시간(float)으로 저장하고, 추가 순서 = 시간 순이므로 bisect로 범위 검색
+        self._ts: List[float] = []
+        self._types: List[MessageType] = []
+        # self.messages와 같은 순서의 format_message 결과 (대화 기록 조회 시 재포맷 방지)
+        self._formatted_cache: List[str] = []
         self._setup_logging()
 
     def _setup_logging(self) -> None:
-        """로깅 설정"""
+        """로깅 설정 (인스턴스가 여러 개여도 핸들러는 한 번만 추가)"""
         logger.setLevel(logging.DEBUG)
+        if any(isinstance(h, logging.StreamHandler) for h in logger.handlers):
+            return
         handler = logging.StreamHandler()
-        handler.setFormatter(
-            logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
-        )
+        handler.setFormatter(_FMT)
         logger.addHandler(handler)
 
     def add_message(
@@ -43,19 +64,20 @@ class MessageService:
         metadata: Optional[Dict[str, Any]] = None
     ) -> Message:
         """새 메시지 추가"""
-        try:
-            message = Message(
-                type=msg_type,
-                content=content,
-                timestamp=datetime.now(),
-                metadata=metadata or {}
-            )
-            self.messages.append(message)
-            logger.debug(f"Added message: {message}")
-            return message
-        except Exception as e:
-            logger.error(f"Error adding message: {e}")
-            raise
+        message = Message(
+            type=msg_type,
+            content=content,
+            timestamp=datetime.fromtimestamp(time.time()),
+            metadata=metadata or {}
+        )
+        self.messages.append(message)
+        self._by_type[msg_type].append(message)
+        # 인덱스는 Message.timestamp(마이크로초 단위로 반올림됨)에서 계산해 경계 비교가 일치하도록 함
+        self._ts.append(message.timestamp.timestamp())
+        self._types.append(msg_type)
+        self._formatted_cache.append(self.format_message(message))
+        logger.debug("Added message: %r", message)
+        return message
 
     def get_messages(
         self, 
@@ -64,53 +86,62 @@ class MessageService:
         end_time: Optional[datetime] = None
     ) -> List[Message]:
         """메시지 조회"""
-        try:
-            filtered_messages = self.messages
+        any_type = msg_type is None
+        no_start = start_time is None
+        no_end = end_time is None
+        if any_type and no_start and no_end:
+            return self.messages
 
-            if msg_type:
-                filtered_messages = [m for m in filtered_messages if m.type == msg_type]
-            
-            if start_time:
-                filtered_messages = [m for m in filtered_messages if m.timestamp >= start_time]
-            
-            if end_time:
-                filtered_messages = [m for m in filtered_messages if m.timestamp <= end_time]
-
-            return filtered_messages
-        except Exception as e:
-            logger.error(f"Error getting messages: {e}")
-            return []
+        # 타입만 지정되면 해당 타입의 메시지만 반환
+        if no_start and no_end:
+            return list(self._by_type[msg_type])
+
+        # 시간 범위는 이진 탐색으로 잘라낸 뒤 타입만 검사
+        lo = 0 if no_start else bisect_left(self._ts, start_time.timestamp())
+        hi = len(self._ts) if no_end else bisect_right(self._ts, end_time.timestamp())
+        if any_type:
+            return self.messages[lo:hi]
+        types = self._types
+        messages = self.messages
+        return [messages[i] for i in range(lo, hi) if types[i] is msg_type]
 
     def clear_messages(self, msg_type: Optional[MessageType] = None) -> None:
         """메시지 삭제"""
         try:
             if msg_type:
-                self.messages = [m for m in self.messages if m.type != msg_type]
+                if self._by_type[msg_type]:
+                    self._by_type[msg_type].clear()
+                    kept = [i for i, t in enumerate(self._types) if t is not msg_type]
+                    self.messages = [self.messages[i] for i in kept]
+                    self._ts = [self._ts[i] for i in kept]
+                    self._types = [self._types[i] for i in kept]
+                    self._formatted_cache = [self._formatted_cache[i] for i in kept]
             else:
                 self.messages.clear()
-            logger.debug(f"Cleared messages: {msg_type if msg_type else 'all'}")
+                self._by_type.clear()
+                self._ts.clear()
+                self._types.clear()
+                self._formatted_cache.clear()
+            logger.debug("Cleared messages: %s", msg_type if msg_type else 'all')
         except Exception as e:
-            logger.error(f"Error clearing messages: {e}")
+            logger.error("Error clearing messages: %s", e)
             raise
 
     def get_last_message(self, msg_type: Optional[MessageType] = None) -> Optional[Message]:
         """마지막 메시지 조회"""
-        try:
-            if msg_type:
-                filtered = [m for m in reversed(self.messages) if m.type == msg_type]
-                return filtered[0] if filtered else None
-            return self.messages[-1] if self.messages else None
-        except Exception as e:
-            logger.error(f"Error getting last message: {e}")
-            return None
+        if msg_type:
+            by_type = self._by_type.get(msg_type)
+            return by_type[-1] if by_type else None
+        return self.messages[-1] if self.messages else None
 
     def format_message(self, message: Message) -> str:
         """메시지 포맷팅"""
         try:
-            timestamp = message.timestamp.strftime("%Y-%m-%d %H:%M:%S")
-            return f"[{timestamp}] {message.type.name}: {message.content}"
+            # isoformat은 strftime처럼 포맷 문자열을 해석하지 않음 (결과는 "%Y-%m-%d %H:%M:%S"와 동일)
+            timestamp = message.timestamp.isoformat(" ", "seconds")
+            return f"[{timestamp}] {_TYPE_NAME[message.type]}: {message.content}"
         except Exception as e:
-            logger.error(f"Error formatting message: {e}")
+            logger.error("Error formatting message: %s", e)
             return f"Error formatting message: {str(e)}"
 
     def get_conversation_history(
@@ -119,13 +150,12 @@ class MessageService:
         include_types: Optional[List[MessageType]] = None
     ) -> List[str]:
         """대화 기록 조회"""
-        try:
-            messages = self.messages
-            if include_types:
-                messages = [m for m in messages if m.type in include_types]
-            if limit:
-                messages = messages[-limit:]
-            return [self.format_message(m) for m in messages]
-        except Exception as e:
-            logger.error(f"Error getting conversation history: {e}")
-            return [] 
\ No newline at end of file
+        formatted = self._formatted_cache
+        if include_types:
+            formatted = [
+                text for t, text in zip(self._types, self._formatted_cache)
+                if t in include_types
+            ]
+        if limit:
+            return formatted[-limit:]
+        return list(formatted)
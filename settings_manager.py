@@ -1,9 +1,14 @@
-from typing import Dict, Any, List, Optional, Protocol, TypeVar, Union, cast
-from dataclasses import dataclass
-from aqt.qt import QSettings
+from typing import TYPE_CHECKING, Callable, Dict, Any, FrozenSet, Iterable, List, Optional, Protocol, Set, Tuple, TypeVar, Union, cast
+from dataclasses import asdict, dataclass, fields
 
+import atexit
 import logging
-from aqt import mw
+import queue
+import sys
+import threading
+
+if TYPE_CHECKING:
+    from aqt.qt import QSettings
 
 logger = logging.getLogger(__name__)
 
@@ -13,7 +18,10 @@ class SettingsObserver(Protocol):
         """설정이 변경되었을 때 호출되는 메서드"""
         ...
 
-@dataclass
+# Python 3.10 이상에서는 __slots__ 데이터클래스로 생성 (__dict__ 없음)
+_DATACLASS_OPTIONS: Dict[str, Any] = {"slots": True} if sys.version_info >= (3, 10) else {}
+
+@dataclass(**_DATACLASS_OPTIONS)
 class Settings:
     """설정 데이터를 담는 클래스"""
     providerType: str = "openai"
@@ -28,6 +36,26 @@ class Settings:
     temperature: float = 0.7
     systemPrompt: str = "You are a helpful assistant."
     debug_logging: bool = False
+    cacheAllResponses: bool = False
+    semanticCacheEnabled: bool = False
+
+def _to_bool(value: Any) -> bool:
+    """QSettings 값을 bool로 변환 (문자열 'false'가 True로 캐스팅되는 문제를 방지)"""
+    if isinstance(value, str):
+        return value.strip().lower() in ("1", "true", "yes", "on")
+    return bool(value)
+
+def _identity(value: Any) -> Any:
+    return value
+
+# 설정 키 -> 타입 변환 함수 (Settings 필드 타입으로 한 번만 계산)
+_COERCERS: Dict[str, Callable[[Any], Any]] = {
+    f.name: {bool: _to_bool, int: int, float: float}.get(f.type, _identity)
+    for f in fields(Settings)
+}
+
+# 저장 가능한 설정 키 (Settings 필드)
+_WRITABLE_KEYS: FrozenSet[str] = frozenset(_COERCERS)
 
 class SettingsError(Exception):
     """설정 관련 예외 클래스"""
@@ -38,76 +66,173 @@ class SettingsManager:
     
     ORGANIZATION: str = "LLM_response_evaluator"
     APPLICATION: str = "Settings"
+    # set_value 후 기록과 옵저버 알림까지 기다리는 시간 (ms)
+    FLUSH_DELAY_MS: int = 250
     
     def __init__(self) -> None:
-        self._settings: QSettings = QSettings(self.ORGANIZATION, self.APPLICATION)
-        self._observers: List[SettingsObserver] = []
+        # Qt는 설정 매니저를 처음 사용할 때 로드
+        from aqt.qt import QCoreApplication, QSettings, QTimer
+        
+        self._settings: "QSettings" = QSettings(self.ORGANIZATION, self.APPLICATION)
+        # id(옵저버) -> (옵저버, 관심 키 집합 또는 None=모든 키)
+        self._observers: Dict[int, Tuple[SettingsObserver, Optional[FrozenSet[str]]]] = {}
         self._current_settings: Settings = Settings()
+        # QSettings에서 시작 시 한 번 읽어 둔 설정값 (이후 조회는 디스크/레지스트리 대신 메모리에서)
+        self._cache: Dict[str, Any] = asdict(self._current_settings)
         self._load_initial_settings()
+        
+        # QSettings 기록은 전용 스레드가 담당 (UI 스레드가 디스크/레지스트리 I/O를 기다리지 않음)
+        self._write_queue: "queue.Queue[Optional[Tuple[str, Any]]]" = queue.Queue()
+        self._writer = threading.Thread(target=self._write_loop, name="settings-writer", daemon=True)
+        self._writer.start()
+        atexit.register(self._shutdown_writer)
+        
+        # set_value 연속 호출을 모아 한 번에 기록/알림 (기록할 키, 값은 기록 시점의 캐시에서 읽음)
+        self._dirty: Set[str] = set()
+        # 워커 스레드의 set_value와 GUI 스레드의 기록/저장이 캐시와 _dirty를 동시에 바꾸지 않도록 보호
+        self._lock = threading.RLock()
+        self._flush_timer = QTimer()
+        self._flush_timer.setSingleShot(True)
+        self._flush_timer.setInterval(self.FLUSH_DELAY_MS)
+        self._flush_timer.timeout.connect(self._flush_dirty)
+        # 타이머는 생성한 스레드에 속하므로, 워커 스레드에서 생성된 경우 GUI 스레드로 옮김
+        app = QCoreApplication.instance()
+        if app is not None and self._flush_timer.thread() is not app.thread():
+            self._flush_timer.moveToThread(app.thread())
+    
+    def _schedule_flush(self) -> None:
+        """기록 타이머를 (재)시작합니다. 워커 스레드에서 호출되면 GUI 스레드에서 시작하도록 넘깁니다."""
+        if threading.current_thread() is threading.main_thread():
+            self._flush_timer.start()
+        else:
+            from aqt import mw
+            mw.taskman.run_on_main(self._flush_timer.start)
+    
+    def _write_loop(self) -> None:
+        """큐에 쌓인 설정값을 QSettings에 기록합니다. 한 번에 쌓인 같은 키는 마지막 값만 기록합니다."""
+        from aqt.qt import QSettings
+        
+        # QSettings 객체는 스레드마다 따로 사용 (같은 설정 파일을 공유)
+        settings = QSettings(self.ORGANIZATION, self.APPLICATION)
+        while True:
+            pending: Dict[str, Any] = {}
+            stop = False
+            item = self._write_queue.get()
+            while True:
+                if item is None:
+                    stop = True
+                else:
+                    pending[item[0]] = item[1]
+                try:
+                    item = self._write_queue.get_nowait()
+                except queue.Empty:
+                    break
+            
+            for key, value in pending.items():
+                try:
+                    settings.setValue(key, value)
+                except Exception as e:
+                    logger.error("설정 기록 실패 (%s): %s", key, e)
+            
+            # 모아서 기록한 뒤 디스크 동기화는 한 번만
+            if pending:
+                settings.sync()
+            if stop:
+                return
+    
+    def _shutdown_writer(self) -> None:
+        """종료 시 남은 기록을 모두 처리하고 디스크에 동기화"""
+        with self._lock:
+            for key in self._dirty:
+                self._write_queue.put((key, self._cache[key]))
+            self._dirty.clear()
+        if self._writer.is_alive():
+            self._write_queue.put(None)
+            self._writer.join(timeout=5)
     
     def _load_initial_settings(self) -> None:
         """초기 설정 로드"""
         try:
-            settings_dict = self.load_settings()
+            settings_dict = self._read_settings()
             for key, value in settings_dict.items():
                 if hasattr(self._current_settings, key):
                     setattr(self._current_settings, key, value)
+            self._cache = settings_dict
         except Exception as e:
-            logger.error(f"초기 설정 로드 실패: {str(e)}")
+            logger.error("초기 설정 로드 실패: %s", e)
             # 기본값 유지
     
-    def add_observer(self, observer: SettingsObserver) -> None:
-        """설정 변경 알림을 받을 옵저버 추가"""
-        if observer not in self._observers:
-            self._observers.append(observer)
-            logger.debug(f"Observer added: {observer.__class__.__name__}")
+    def add_observer(self, observer: SettingsObserver, keys: Optional[Iterable[str]] = None) -> None:
+        """설정 변경 알림을 받을 옵저버 추가 (keys를 주면 그 키가 바뀔 때만 알림)"""
+        if id(observer) not in self._observers:
+            self._observers[id(observer)] = (observer, frozenset(keys) if keys is not None else None)
+            logger.debug("Observer added: %s", observer.__class__.__name__)
     
     def remove_observer(self, observer: SettingsObserver) -> None:
         """옵저버 제거"""
-        if observer in self._observers:
-            self._observers.remove(observer)
-            logger.debug(f"Observer removed: {observer.__class__.__name__}")
+        if self._observers.pop(id(observer), None) is not None:
+            logger.debug("Observer removed: %s", observer.__class__.__name__)
     
-    def notify_observers(self, settings: Dict[str, Any]) -> None:
-        """모든 옵저버에게 설정 변경 알림"""
-        for observer in self._observers:
+    def notify_observers(self, settings: Dict[str, Any], changed_keys: Optional[Iterable[str]] = None) -> None:
+        """옵저버에게 설정 변경 알림 (changed_keys가 주어지면 관심 키가 바뀐 옵저버만)"""
+        changed = frozenset(changed_keys) if changed_keys is not None else None
+        # 알림 중 옵저버가 추가/제거되어도 안전하도록 스냅샷을 순회
+        for observer, keys in list(self._observers.values()):
+            if keys is not None and changed is not None and not keys & changed:
+                continue
             try:
                 observer.update_config(settings)
             except Exception as e:
-                logger.error(f"Observer notification failed: {observer.__class__.__name__} - {str(e)}")
+                logger.error("Observer notification failed: %s - %s", observer.__class__.__name__, e)
     
     def load_settings(self) -> Dict[str, Any]:
-        """설정 로드"""
-        try:
-            settings = {}
-            current = self._current_settings.__dict__
-            
-            for key, default_value in current.items():
-                value = self._settings.value(key, default_value)
-                
-                # 타입 변환 (특히 bool은 문자열 'false'가 True로 캐스팅되는 문제를 방지)
-                if isinstance(default_value, bool):
-                    if isinstance(value, bool):
-                        pass
-                    elif isinstance(value, (int, float)):
-                        value = bool(value)
-                    elif isinstance(value, str):
-                        value_lower = value.strip().lower()
-                        value = value_lower in ("1", "true", "yes", "on")
-                    else:
-                        value = bool(value)
-                elif isinstance(default_value, int):
-                    value = int(value)
-                elif isinstance(default_value, float):
-                    value = float(value)
-                
-                settings[key] = value
-            
-            return settings
-            
-        except Exception as e:
-            logger.error(f"설정 로드 실패: {str(e)}")
-            return self._current_settings.__dict__.copy()
+        """설정 로드 (메모리 캐시의 복사본)"""
+        return self._cache.copy()
+    
+    def _read_settings(self) -> Dict[str, Any]:
+        """QSettings에서 모든 설정값을 읽어 타입을 맞춥니다."""
+        settings = {}
+        for key, default_value in asdict(self._current_settings).items():
+            settings[key] = _COERCERS[key](self._settings.value(key, default_value))
+        
+        return settings
+    
+    def _update_value(self, key: str, value: Any) -> Optional[Tuple[str, Any]]:
+        """캐시와 현재 설정을 갱신하고, QSettings에 기록할 (키, 값)을 반환 (바뀐 값이 없거나 저장 대상이 아니면 None)"""
+        if key not in _WRITABLE_KEYS:
+            logger.debug("Ignoring unknown setting: %s", key)
+            return None
+        value = _COERCERS[key](value)
+        if self._cache[key] == value:
+            return None
+        self._cache[key] = value
+        setattr(self._current_settings, key, value)
+        return key, value
+    
+    def _flush_dirty(self) -> None:
+        """set_value로 쌓인 변경을 기록하고 옵저버에게 한 번만 알림"""
+        with self._lock:
+            if not self._dirty:
+                return
+            changed = {key: self._cache[key] for key in self._dirty}
+            self._dirty.clear()
+            for item in changed.items():
+                self._write_queue.put(item)
+            self._update_addon_settings(changed)
+            snapshot = self._cache.copy()
+        
+        # 옵저버들에게 알림 (옵저버가 캐시를 바꾸지 못하도록 복사본 전달)
+        self.notify_observers(snapshot, changed)
+    
+    def _update_addon_settings(self, changed: Dict[str, Any]) -> None:
+        """mw.llm_addon_settings에 바뀐 값만 반영 (처음에는 캐시 복사본으로 생성)"""
+        from aqt import mw
+        
+        addon_settings = getattr(mw, "llm_addon_settings", None)
+        if addon_settings is None:
+            mw.llm_addon_settings = self._cache.copy()
+        elif changed:
+            addon_settings.update(changed)
     
     def save_settings(self, settings: Dict[str, Any]) -> bool:
         """설정 저장"""
@@ -115,27 +240,38 @@ class SettingsManager:
             # 설정값 검증
             self._validate_settings(settings)
             
-            # 설정 저장
-            for key, value in settings.items():
-                self._settings.setValue(key, value)
-                if hasattr(self._current_settings, key):
-                    setattr(self._current_settings, key, value)
-            
-            # 전역 설정 업데이트
-            mw.llm_addon_settings = settings.copy()
+            with self._lock:
+                # 값이 바뀐 키와, set_value로 바뀌어 아직 기록되지 않은 키를 함께 기록 (타이머가 다시 기록/알림하지 않도록 _dirty에서 제거)
+                keys: Set[str] = self._dirty.intersection(settings)
+                for key, value in settings.items():
+                    if self._update_value(key, value) is not None:
+                        keys.add(key)
+                self._dirty -= keys
+                changed = {key: self._cache[key] for key in keys}
+                for item in changed.items():
+                    self._write_queue.put(item)
+                
+                # 전역 설정 업데이트
+                self._update_addon_settings(changed)
+                snapshot = self._cache.copy()
             
             # 로깅 레벨 설정
             debug_logging = settings.get("debug_logging", False)
             logger.setLevel(logging.DEBUG if debug_logging else logging.INFO)
             
-            # 옵저버들에게 알림
-            self.notify_observers(settings)
+            # 바뀐 값이 없으면 옵저버 알림 생략
+            if not changed:
+                logger.debug("Settings unchanged, skipping observer notification")
+                return True
+            
+            # 옵저버들에게 알림 (옵저버는 전체 설정을 기대하므로 병합된 캐시의 복사본 전달)
+            self.notify_observers(snapshot, changed)
             
             logger.debug("Settings saved successfully")
             return True
             
         except Exception as e:
-            logger.error(f"설정 저장 실패: {str(e)}")
+            logger.error("설정 저장 실패: %s", e)
             return False
     
     def _validate_settings(self, settings: Dict[str, Any]) -> None:
@@ -167,38 +303,48 @@ class SettingsManager:
     def get_value(self, key: str, default: Any = None) -> Any:
         """특정 설정값 조회"""
         try:
-            if hasattr(self._current_settings, key):
-                return getattr(self._current_settings, key)
+            if key in self._cache:
+                return self._cache[key]
             return self._settings.value(key, default)
         except Exception as e:
-            logger.error(f"설정값 조회 실패 ({key}): {str(e)}")
+            logger.error("설정값 조회 실패 (%s): %s", key, e)
             return default
     
     def set_value(self, key: str, value: Any) -> bool:
-        """특정 설정값 변경"""
+        """특정 설정값 변경 (Settings에 없는 키는 저장하지 않고 False 반환)"""
+        if key not in _WRITABLE_KEYS:
+            logger.warning("Unknown setting ignored: %s", key)
+            return False
         try:
-            # 설정값 검증
-            test_settings = self.load_settings()
-            test_settings[key] = value
-            self._validate_settings(test_settings)
-            
-            # 설정 저장
-            self._settings.setValue(key, value)
-            if hasattr(self._current_settings, key):
-                setattr(self._current_settings, key, value)
-            
-            # 전체 설정 로드
-            current_settings = self.load_settings()
-            
-            # 옵저버들에게 알림
-            self.notify_observers(current_settings)
+            with self._lock:
+                # 설정값 검증
+                self._validate_settings({**self._cache, key: value})
+                
+                # 캐시는 즉시 갱신하고, 기록과 옵저버 알림은 타이머로 모아서 처리
+                changed = self._update_value(key, value) is not None
+                if changed:
+                    self._dirty.add(key)
+            if changed:
+                self._schedule_flush()
             
-            logger.debug(f"Setting updated: {key} = {value}")
+            logger.debug("Setting updated: %s = %r", key, value)
             return True
             
         except Exception as e:
-            logger.error(f"설정값 변경 실패 ({key}): {str(e)}")
+            logger.error("설정값 변경 실패 (%s): %s", key, e)
             return False
 
-# 전역 설정 매니저 인스턴스
-settings_manager = SettingsManager() 
\ No newline at end of file
+# 전역 설정 매니저 인스턴스 (get_settings_manager 첫 호출 시 생성)
+# 지연 생성은 QSettings 읽기를 첫 호출 시점으로 미룰 뿐이며, 실제로는 initialize_addon과
+# Bridge.__init__이 시작 시 GUI 스레드에서 먼저 호출합니다.
+_instance: Optional[SettingsManager] = None
+_instance_lock = threading.Lock()
+
+def get_settings_manager() -> SettingsManager:
+    """전역 설정 매니저 인스턴스를 반환합니다. 처음 호출될 때 QSettings를 읽어 생성합니다."""
+    global _instance
+    if _instance is None:
+        with _instance_lock:
+            if _instance is None:
+                _instance = SettingsManager()
+    return _instance